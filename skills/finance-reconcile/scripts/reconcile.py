@@ -4,15 +4,45 @@
 支持资产负债表、利润表审计，科目变动追踪，报表勾稽关系验证
 """
 
+import re
+import shutil
 import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
 import pandas as pd
 
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 class AccountType(Enum):
     """账户类型"""
@@ -24,6 +54,9 @@ class AccountType(Enum):
     PROFIT_ITEM = "利润项目"
 
 
+# 账户类型取值（按列存储时作为分类编码的类别）
+ACCOUNT_TYPE_VALUES = [t.value for t in AccountType]
+
 @dataclass
 class AccountBalance:
     """账户余额"""
@@ -37,6 +70,89 @@ class AccountBalance:
     diff: float = 0.0
 
 
+@dataclass
+class AccountBalanceFrame:
+    """
+    科目余额表（按列存储）
+
+    字段与 AccountBalance 一一对应，每个字段为按科目顺序排列的等长数组，
+    便于整列计算；迭代时逐个产出 AccountBalance
+    """
+    account: np.ndarray
+    account_type: pd.Categorical
+    opening_balance: np.ndarray
+    debit_change: np.ndarray
+    credit_change: np.ndarray
+    closing_balance: np.ndarray
+    is_balanced: np.ndarray
+    diff: np.ndarray
+
+    @classmethod
+    def from_columns(
+        cls,
+        account: np.ndarray,
+        account_type: pd.Categorical,
+        opening_balance: np.ndarray,
+        closing_balance: np.ndarray
+    ) -> "AccountBalanceFrame":
+        """由科目、类型、期初和期末余额列构建，变动和差异初始化为 0"""
+        n = len(account)
+        return cls(
+            account=np.asarray(account, dtype=object),
+            account_type=account_type,
+            opening_balance=np.asarray(opening_balance, dtype=np.float64),
+            debit_change=np.zeros(n, dtype=np.float64),
+            credit_change=np.zeros(n, dtype=np.float64),
+            closing_balance=np.asarray(closing_balance, dtype=np.float64),
+            is_balanced=np.ones(n, dtype=bool),
+            diff=np.zeros(n, dtype=np.float64)
+        )
+
+    @classmethod
+    def from_balances(cls, balances: List[AccountBalance]) -> "AccountBalanceFrame":
+        """由 AccountBalance 列表构建"""
+        n = len(balances)
+        return cls(
+            account=np.array([b.account for b in balances], dtype=object),
+            account_type=pd.Categorical(
+                [b.account_type.value for b in balances],
+                categories=ACCOUNT_TYPE_VALUES
+            ),
+            opening_balance=np.fromiter((b.opening_balance for b in balances), dtype=np.float64, count=n),
+            debit_change=np.fromiter((b.debit_change for b in balances), dtype=np.float64, count=n),
+            credit_change=np.fromiter((b.credit_change for b in balances), dtype=np.float64, count=n),
+            closing_balance=np.fromiter((b.closing_balance for b in balances), dtype=np.float64, count=n),
+            is_balanced=np.fromiter((b.is_balanced for b in balances), dtype=bool, count=n),
+            diff=np.fromiter((b.diff for b in balances), dtype=np.float64, count=n)
+        )
+
+    def __len__(self) -> int:
+        return len(self.account)
+
+    def __iter__(self) -> Iterator[AccountBalance]:
+        columns = zip(
+            self.account,
+            self.account_type,
+            self.opening_balance.tolist(),
+            self.debit_change.tolist(),
+            self.credit_change.tolist(),
+            self.closing_balance.tolist(),
+            self.is_balanced.tolist(),
+            self.diff.tolist()
+        )
+        for account, account_type, opening, debit, credit, closing, is_balanced, diff in columns:
+            yield AccountBalance(
+                account=account,
+                account_type=AccountType(account_type),
+                opening_balance=opening,
+                debit_change=debit,
+                credit_change=credit,
+                closing_balance=closing,
+                is_balanced=is_balanced,
+                diff=diff
+            )
+
+
 @dataclass
 class ProfitItem:
     """利润项目"""
@@ -61,14 +177,39 @@ class AuditResult:
 # 文件读取工具
 # ============================================================================
 
+def open_excel_file(filepath: Union[str, Path]) -> pd.ExcelFile:
+    """
+    打开 Excel 工作簿（调用方负责关闭）
+
+    优先使用 calamine 引擎（解析更快、内存占用更低），
+    未安装 python-calamine 或 pandas 版本不支持时回退到 pandas 按文件类型自动选择的引擎
+    （.xlsx 用 openpyxl，.xls 用 xlrd，.ods 用 odf）
+    """
+    if CALAMINE_AVAILABLE:
+        try:
+            return pd.ExcelFile(filepath, engine="calamine")
+        except (ImportError, ValueError):
+            pass
+    return pd.ExcelFile(filepath)
+
+
 def read_excel_file(
     filepath: Union[str, Path],
-    sheet_name: Optional[Union[str, int]] = None,
-    header: int = 0
+    sheet_name: Union[str, int] = 0,
+    header: int = 0,
+    xl: Optional[pd.ExcelFile] = None
 ) -> pd.DataFrame:
-    """读取 Excel 文件，自动处理编码和空值"""
+    """
+    读取 Excel 文件，自动处理编码和空值
+
+    传入已打开的工作簿 xl 时直接从中读取 sheet；否则临时打开文件，读取后立即关闭
+    """
     try:
-        df = pd.read_excel(filepath, sheet_name=sheet_name, header=header)
+        if xl is None:
+            with open_excel_file(filepath) as workbook:
+                df = workbook.parse(sheet_name, header=header)
+        else:
+            df = xl.parse(sheet_name, header=header)
         # 清理列名：去除前后空格
         df.columns = df.columns.str.strip()
         return df
@@ -76,6 +217,47 @@ def read_excel_file(
         raise ValueError(f"读取 Excel 文件失败 {filepath}: {e}")
 
 
+def read_excel_files(
+    sources: Dict[str, Tuple[Union[str, Path], Union[str, int]]],
+    max_workers: int = 5
+) -> Dict[str, pd.DataFrame]:
+    """
+    并行读取多个 Excel 报表
+
+    不同工作簿在线程池中并行读取；同一工作簿的多个 sheet 在同一线程内
+    依次读取，共享一次打开的工作簿，读取完该工作簿的所有 sheet 后即关闭。
+
+    Args:
+        sources: 报表来源 {名称: (文件路径, sheet 名称或索引)}
+        max_workers: 最大线程数
+
+    Returns:
+        报表字典 {名称: DataFrame}
+    """
+    by_file: Dict[str, List[Tuple[str, Union[str, int]]]] = {}
+    for name, (filepath, sheet_name) in sources.items():
+        by_file.setdefault(str(filepath), []).append((name, sheet_name))
+
+    def read_workbook(filepath: str, entries: List[Tuple[str, Union[str, int]]]) -> Dict[str, pd.DataFrame]:
+        try:
+            xl = open_excel_file(filepath)
+        except Exception as e:
+            raise ValueError(f"读取 Excel 文件失败 {filepath}: {e}")
+        with xl:
+            return {name: read_excel_file(filepath, sheet_name, xl=xl) for name, sheet_name in entries}
+
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(read_workbook, filepath, entries)
+            for filepath, entries in by_file.items()
+        ]
+        for future in futures:
+            frames.update(future.result())
+
+    return frames
+
+
 def validate_columns(df: pd.DataFrame, required_columns: List[str], df_name: str) -> None:
     """验证 DataFrame 是否包含必需的列"""
     missing_columns = [col for col in required_columns if col not in df.columns]
@@ -84,13 +266,38 @@ def validate_columns(df: pd.DataFrame, required_columns: List[str], df_name: str
 
 
 def to_float(value: Any) -> float:
-    """转换为浮点数，处理空值和无效值"""
+    """转换单个值为浮点数，处理空值和无效值（整列转换请使用 to_float_series）"""
     try:
         return float(value) if pd.notna(value) else 0.0
     except (ValueError, TypeError):
         return 0.0
 
 
+def to_float_series(series: pd.Series) -> pd.Series:
+    """整列转换为浮点数，空值和无效值记为 0.0"""
+    return pd.to_numeric(series, errors="coerce").fillna(0.0).astype(np.float64)
+
+
+def strip_text(series: pd.Series) -> pd.Series:
+    """整列转换为去除首尾空格的字符串，空值与逐行 str() 转换一致记为 nan"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if not series.hasnans:
+            # 分类列只需处理类别本身，无需逐行处理
+            categories = series.cat.categories.astype(str).str.strip()
+            if categories.is_unique:
+                return series.cat.rename_categories(categories)
+        series = series.astype(object)
+    return series.fillna("nan").astype(str).str.strip()
+
+
+def categorize_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """将科目、类型等重复度高的文本列去除首尾空格后原地转为分类类型"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = strip_text(df[col]).astype("category")
+    return df
+
+
 # ============================================================================
 # 资产负债表审计
 # ============================================================================
@@ -100,7 +307,7 @@ def parse_balance_sheet(
     account_col: str = "科目",
     opening_col: str = "期初余额",
     closing_col: str = "期末余额"
-) -> Dict[str, AccountBalance]:
+) -> AccountBalanceFrame:
     """
     解析资产负债表
 
@@ -111,30 +318,35 @@ def parse_balance_sheet(
         closing_col: 期末余额列名
 
     Returns:
-        科目余额字典 {科目: AccountBalance}
+        科目余额表（重复科目以最后一行为准）
     """
     validate_columns(df, [account_col, opening_col, closing_col], "资产负债表")
 
-    accounts = {}
-    for _, row in df.iterrows():
-        account = str(row[account_col]).strip()
-        if not account or account in ["合计", "总计", "小计"]:
-            continue
-
-        opening = to_float(row[opening_col])
-        closing = to_float(row[closing_col])
-
-        # 推断账户类型（简化版，实际应根据科目编码或分类）
-        account_type = AccountType.ASSET  # 默认为资产
-
-        accounts[account] = AccountBalance(
-            account=account,
-            account_type=account_type,
-            opening_balance=opening,
-            closing_balance=closing
-        )
-
-    return accounts
+    # 按列整体转换，避免逐行 iterrows
+    accounts_arr = strip_text(df[account_col]).to_numpy(dtype=object)
+    opening_arr = to_float_series(df[opening_col]).to_numpy()
+    closing_arr = to_float_series(df[closing_col]).to_numpy()
+
+    mask = ~np.isin(accounts_arr, ["合计", "总计", "小计"]) & (accounts_arr != "")
+    rows = np.flatnonzero(mask)
+
+    # 重复科目：保留首次出现的位置，取最后一行的数值
+    codes, uniques = pd.factorize(accounts_arr[rows], sort=False)
+    last_rows = np.zeros(len(uniques), dtype=np.intp)
+    np.maximum.at(last_rows, codes, rows)
+
+    # 推断账户类型（简化版，实际应根据科目编码或分类）
+    account_type = pd.Categorical.from_codes(
+        np.full(len(uniques), ACCOUNT_TYPE_VALUES.index(AccountType.ASSET.value), dtype=np.int8),
+        categories=ACCOUNT_TYPE_VALUES
+    )  # 默认为资产
+
+    return AccountBalanceFrame.from_columns(
+        account=np.asarray(uniques, dtype=object),
+        account_type=account_type,
+        opening_balance=opening_arr[last_rows],
+        closing_balance=closing_arr[last_rows]
+    )
 
 
 def parse_account_changes(
@@ -157,30 +369,43 @@ def parse_account_changes(
     """
     validate_columns(df, [account_col, debit_col, credit_col], "科目变动明细表")
 
-    changes = {}
-    for _, row in df.iterrows():
-        account = str(row[account_col]).strip()
-        if not account:
-            continue
+    accounts = strip_text(df[account_col])
+    mask = (accounts != "").to_numpy()
+    debit_arr = to_float_series(df[debit_col]).to_numpy()[mask]
+    credit_arr = to_float_series(df[credit_col]).to_numpy()[mask]
 
-        debit = to_float(row[debit_col])
-        credit = to_float(row[credit_col])
+    # 累计变动：科目映射为整数编号后按编号求和（保持首次出现顺序）
+    codes, uniques = pd.factorize(accounts[mask], sort=False)
+    debit_sum = np.bincount(codes, weights=debit_arr, minlength=len(uniques))
+    credit_sum = np.bincount(codes, weights=credit_arr, minlength=len(uniques))
+
+    return dict(zip(uniques, zip(debit_sum.tolist(), credit_sum.tolist())))
+
+
+# 科目数达到该值时才使用 numba 并行内核；常规资产负债表只有几十到几百行，
+# JIT 加载与线程池启动的开销高于向量化的 NumPy 计算
+PARALLEL_VALIDATE_MIN_ROWS = 100000
 
-        # 累计变动
-        if account in changes:
-            prev_debit, prev_credit = changes[account]
-            changes[account] = (prev_debit + debit, prev_credit + credit)
-        else:
-            changes[account] = (debit, credit)
 
-    return changes
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _validate_kernel(opening, closing, debit, credit, is_asset, tolerance, diff_out, balanced_out):
+        """逐科目计算差异与平衡标记，单次循环完成，不产生中间数组"""
+        for i in prange(opening.shape[0]):
+            if is_asset[i]:
+                expected = opening[i] + debit[i] - credit[i]
+            else:
+                expected = opening[i] + credit[i] - debit[i]
+            d = abs(closing[i] - expected)
+            diff_out[i] = d
+            balanced_out[i] = d <= tolerance
 
 
 def validate_balance_sheet(
-    balance_sheet: Dict[str, AccountBalance],
+    balance_sheet: AccountBalanceFrame,
     account_changes: Dict[str, Tuple[float, float]],
     tolerance: float = 0.01
-) -> List[AccountBalance]:
+) -> AccountBalanceFrame:
     """
     验证资产负债表平衡
 
@@ -192,32 +417,137 @@ def validate_balance_sheet(
         tolerance: 容忍误差
 
     Returns:
-        更新后的科目列表（包含是否平衡标记）
+        原地更新后的科目余额表（包含是否平衡标记）
     """
-    results = []
+    n = len(balance_sheet)
+    # 两表科目统一编号，按整数编号取变动额，避免逐科目查字典
+    change_accounts = np.array(list(account_changes), dtype=object)
+    codes, uniques = pd.factorize(np.concatenate([np.asarray(balance_sheet.account, dtype=object), change_accounts]))
+    debit_by_code = np.zeros(len(uniques), dtype=np.float64)
+    credit_by_code = np.zeros(len(uniques), dtype=np.float64)
+    if len(change_accounts):
+        change_values = np.array(list(account_changes.values()), dtype=np.float64)
+        debit_by_code[codes[n:]] = change_values[:, 0]
+        credit_by_code[codes[n:]] = change_values[:, 1]
+    debit = debit_by_code[codes[:n]]
+    credit = credit_by_code[codes[:n]]
+    is_asset = np.asarray(balance_sheet.account_type == AccountType.ASSET.value, dtype=bool)
+
+    balance_sheet.debit_change = debit
+    balance_sheet.credit_change = credit
+
+    # 计算预期期末余额
+    # 资产类：期初 + 借方 - 贷方 = 期末
+    # 负债权益类：期初 + 贷方 - 借方 = 期末
+    if NUMBA_AVAILABLE and n >= PARALLEL_VALIDATE_MIN_ROWS:
+        balance_sheet.diff = np.empty(n, dtype=np.float64)
+        balance_sheet.is_balanced = np.empty(n, dtype=bool)
+        _validate_kernel(
+            np.ascontiguousarray(balance_sheet.opening_balance, dtype=np.float64),
+            np.ascontiguousarray(balance_sheet.closing_balance, dtype=np.float64),
+            debit, credit, is_asset, float(tolerance),
+            balance_sheet.diff, balance_sheet.is_balanced
+        )
+    else:
+        expected_closing = balance_sheet.opening_balance + np.where(is_asset, debit - credit, credit - debit)
+        balance_sheet.diff = np.abs(balance_sheet.closing_balance - expected_closing)
+        balance_sheet.is_balanced = balance_sheet.diff <= tolerance
 
-    for account, balance in balance_sheet.items():
-        debit, credit = account_changes.get(account, (0.0, 0.0))
+    return balance_sheet
 
-        # 计算预期期末余额
-        # 资产类：期初 + 借方 - 贷方 = 期末
-        # 负债权益类：期初 + 贷方 - 借方 = 期末
-        if balance.account_type in [AccountType.ASSET]:
-            expected_closing = balance.opening_balance + debit - credit
-        else:
-            expected_closing = balance.opening_balance + credit - debit
 
-        diff = abs(balance.closing_balance - expected_closing)
-        is_balanced = diff <= tolerance
+def validate_balance_sheet_polars(
+    bs_df: pd.DataFrame,
+    changes_df: pd.DataFrame,
+    account_col: str = "科目",
+    opening_col: str = "期初余额",
+    closing_col: str = "期末余额",
+    changes_account_col: str = "科目",
+    debit_col: str = "借方",
+    credit_col: str = "贷方",
+    tolerance: float = 0.01
+) -> AccountBalanceFrame:
+    """
+    使用 Polars LazyFrame 解析并验证资产负债表
 
-        balance.debit_change = debit
-        balance.credit_change = credit
-        balance.diff = diff
-        balance.is_balanced = is_balanced
+    与 parse_balance_sheet + parse_account_changes + validate_balance_sheet
+    结果一致：小计行过滤、科目变动分组求和、按科目连接及余额计算组成一个
+    惰性查询，由 Polars 优化后多线程执行，只 collect 一次
 
-        results.append(balance)
+    Args:
+        bs_df: 资产负债表 DataFrame
+        changes_df: 科目变动明细表 DataFrame
+        account_col: 资产负债表科目列名
+        opening_col: 期初余额列名
+        closing_col: 期末余额列名
+        changes_account_col: 科目变动表科目列名
+        debit_col: 借方列名
+        credit_col: 贷方列名
+        tolerance: 容忍误差
 
-    return results
+    Returns:
+        验证后的科目余额表
+    """
+    if not POLARS_AVAILABLE:
+        raise ImportError("使用 polars 后端需要安装 polars: pip install polars")
+
+    validate_columns(bs_df, [account_col, opening_col, closing_col], "资产负债表")
+    validate_columns(changes_df, [changes_account_col, debit_col, credit_col], "科目变动明细表")
+
+    # 推断账户类型（简化版，与 parse_balance_sheet 一致，默认为资产）
+    asset = AccountType.ASSET.value
+
+    # 各列先在 pandas/NumPy 中整列处理好，以 NumPy 数组交给 Polars，不经过 Python 列表
+    balances = (
+        pl.LazyFrame({
+            "account": strip_text(bs_df[account_col]).to_numpy(dtype=object),
+            "opening": to_float_series(bs_df[opening_col]).to_numpy(),
+            "closing": to_float_series(bs_df[closing_col]).to_numpy(),
+        }, schema={"account": pl.String, "opening": pl.Float64, "closing": pl.Float64})
+        .filter(~pl.col("account").is_in(["合计", "总计", "小计"]) & (pl.col("account") != ""))
+        # 重复科目：保留首次出现的位置，取最后一行的数值
+        .group_by("account", maintain_order=True)
+        .agg(pl.col("opening").last(), pl.col("closing").last())
+        .with_row_index("position")
+        .with_columns(pl.lit(asset).alias("account_type"))
+    )
+    changes = (
+        pl.LazyFrame({
+            "account": strip_text(changes_df[changes_account_col]).to_numpy(dtype=object),
+            "debit": to_float_series(changes_df[debit_col]).to_numpy(),
+            "credit": to_float_series(changes_df[credit_col]).to_numpy(),
+        }, schema={"account": pl.String, "debit": pl.Float64, "credit": pl.Float64})
+        .filter(pl.col("account") != "")
+        .group_by("account")
+        .agg(pl.col("debit").sum(), pl.col("credit").sum())
+    )
+
+    # 资产类：期初 + 借方 - 贷方 = 期末；负债权益类：期初 + 贷方 - 借方 = 期末
+    net_change = (
+        pl.when(pl.col("account_type") == asset)
+        .then(pl.col("debit") - pl.col("credit"))
+        .otherwise(pl.col("credit") - pl.col("debit"))
+    )
+    validated = (
+        balances
+        .join(changes, on="account", how="left")
+        .with_columns(pl.col("debit").fill_null(0.0), pl.col("credit").fill_null(0.0))
+        .with_columns((pl.col("closing") - (pl.col("opening") + net_change)).abs().alias("diff"))
+        .with_columns((pl.col("diff") <= tolerance).alias("is_balanced"))
+        .sort("position")
+        .collect()
+    )
+
+    return AccountBalanceFrame(
+        account=validated["account"].to_numpy(),
+        account_type=pd.Categorical(validated["account_type"].to_numpy(), categories=ACCOUNT_TYPE_VALUES),
+        opening_balance=validated["opening"].to_numpy(),
+        debit_change=validated["debit"].to_numpy(),
+        credit_change=validated["credit"].to_numpy(),
+        closing_balance=validated["closing"].to_numpy(),
+        is_balanced=validated["is_balanced"].to_numpy(),
+        diff=validated["diff"].to_numpy()
+    )
 
 
 def verify_balance_sheet_total(
@@ -239,12 +569,8 @@ def verify_balance_sheet_total(
     if type_col not in df.columns or amount_col not in df.columns:
         return {"is_balanced": False, "error": "缺少必要的列"}
 
-    totals = {"资产": 0.0, "负债": 0.0, "所有者权益": 0.0}
-
-    for _, row in df.iterrows():
-        acc_type = str(row[type_col]).strip()
-        amount = to_float(row[amount_col])
-        totals[acc_type] = totals.get(acc_type, 0.0) + amount
+    amounts = to_float_series(df[amount_col])
+    totals = amounts.groupby(strip_text(df[type_col]), observed=True).sum().to_dict()
 
     assets = totals.get("资产", 0.0)
     liabilities_equity = totals.get("负债", 0.0) + totals.get("所有者权益", 0.0)
@@ -265,6 +591,13 @@ def verify_balance_sheet_total(
 # 利润表审计
 # ============================================================================
 
+# 增加利润 / 减少利润的项目关键字
+POSITIVE_KEYWORDS = ["收入", "收益", "利得", "其他收益", "营业外收入"]
+NEGATIVE_KEYWORDS = ["成本", "费用", "损失", "减值", "营业外支出", "所得税"]
+POSITIVE_PATTERN = re.compile("|".join(map(re.escape, POSITIVE_KEYWORDS)))
+NEGATIVE_PATTERN = re.compile("|".join(map(re.escape, NEGATIVE_KEYWORDS)))
+
+
 def parse_income_statement(
     df: pd.DataFrame,
     item_col: str = "项目",
@@ -283,25 +616,23 @@ def parse_income_statement(
     """
     validate_columns(df, [item_col, amount_col], "利润表")
 
-    items = []
-    for _, row in df.iterrows():
-        item = str(row[item_col]).strip()
-        if not item or item in ["合计", "总计"]:
-            continue
-
-        amount = to_float(row[amount_col])
+    item_series = strip_text(df[item_col])
+    item_arr = item_series.to_numpy(dtype=object)
+    amount_arr = to_float_series(df[amount_col]).to_numpy()
 
-        # 判断是否为增加利润的项目
-        positive_keywords = ["收入", "收益", "利得", "其他收益", "营业外收入"]
-        negative_keywords = ["成本", "费用", "损失", "减值", "营业外支出", "所得税"]
+    mask = ~np.isin(item_arr, ["合计", "总计"]) & (item_arr != "")
 
-        is_positive = any(kw in item for kw in positive_keywords)
-        if any(kw in item for kw in negative_keywords):
-            is_positive = False
+    # 判断是否为增加利润的项目：关键字正则整列匹配
+    pos_mask = item_series.str.contains(POSITIVE_PATTERN).to_numpy(dtype=bool)
+    neg_mask = item_series.str.contains(NEGATIVE_PATTERN).to_numpy(dtype=bool)
+    is_positive_arr = pos_mask & ~neg_mask
 
-        items.append(ProfitItem(item=item, amount=amount, is_positive=is_positive))
-
-    return items
+    return [
+        ProfitItem(item=item, amount=amount, is_positive=is_positive)
+        for item, amount, is_positive in zip(
+            item_arr[mask], amount_arr[mask].tolist(), is_positive_arr[mask].tolist()
+        )
+    ]
 
 
 def verify_income_statement_with_details(
@@ -323,30 +654,31 @@ def verify_income_statement_with_details(
         验证结果列表
     """
     # 汇总明细表
-    details_summary = {}
-    for _, row in details_df.iterrows():
-        item = str(row[item_col]).strip()
-        if not item:
-            continue
-        amount = to_float(row[amount_col])
-        details_summary[item] = details_summary.get(item, 0.0) + amount
-
-    results = []
-    for income_item in income_items:
-        detail_amount = details_summary.get(income_item.item, 0.0)
-        diff = abs(income_item.amount - detail_amount)
-        is_matched = diff <= 0.01
-
-        results.append({
-            "项目": income_item.item,
-            "利润表金额": income_item.amount,
-            "明细表金额": detail_amount,
-            "差异": diff,
-            "是否匹配": is_matched,
-            "增加利润": income_item.is_positive
-        })
-
-    return results
+    detail_amounts = to_float_series(details_df[amount_col])
+    details_summary = detail_amounts.groupby(strip_text(details_df[item_col]), observed=True).sum().to_dict()
+
+    # 按列填充结果，最后一次性构造 DataFrame
+    n = len(income_items)
+    items = np.empty(n, dtype=object)
+    amounts = np.empty(n, dtype=np.float64)
+    detail = np.empty(n, dtype=np.float64)
+    is_positive = np.empty(n, dtype=bool)
+    for i, income_item in enumerate(income_items):
+        items[i] = income_item.item
+        amounts[i] = income_item.amount
+        detail[i] = details_summary.get(income_item.item, 0.0)
+        is_positive[i] = income_item.is_positive
+
+    diff = np.abs(amounts - detail)
+
+    return pd.DataFrame({
+        "项目": items,
+        "利润表金额": amounts,
+        "明细表金额": detail,
+        "差异": diff,
+        "是否匹配": diff <= 0.01,
+        "增加利润": is_positive
+    }).to_dict("records")
 
 
 # ============================================================================
@@ -354,7 +686,7 @@ def verify_income_statement_with_details(
 # ============================================================================
 
 def verify_cross_validation(
-    balance_sheet: Dict[str, AccountBalance],
+    balance_sheet: AccountBalanceFrame,
     net_profit: float,
     tolerance: float = 0.01
 ) -> Dict[str, Any]:
@@ -377,13 +709,13 @@ def verify_cross_validation(
         "未分配利润", "盈余公积", "未分配收益"
     ]
 
+    # 按关键字优先级整列匹配科目名称，取第一个命中的科目
+    account_names = pd.Series(balance_sheet.account, dtype=object)
     retained_earnings = None
     for key in retained_earnings_keys:
-        for account, balance in balance_sheet.items():
-            if key in account:
-                retained_earnings = balance
-                break
-        if retained_earnings:
+        mask = account_names.str.contains(key, regex=False).to_numpy(dtype=bool)
+        if mask.any():
+            retained_earnings = int(mask.argmax())
             break
 
     results = {
@@ -392,9 +724,12 @@ def verify_cross_validation(
         "retained_earnings_change": 0.0
     }
 
-    if retained_earnings:
+    if retained_earnings is not None:
         # 未分配利润变动
-        change = retained_earnings.closing_balance - retained_earnings.opening_balance
+        change = float(
+            balance_sheet.closing_balance[retained_earnings]
+            - balance_sheet.opening_balance[retained_earnings]
+        )
         results["retained_earnings_change"] = change
 
         # 验证是否匹配（可能有利润分配，所以不完全等于净利润）
@@ -429,54 +764,53 @@ def trace_transaction_impact(
     Returns:
         交易影响追踪列表
     """
-    trace_list = []
-
-    for _, row in transactions_df.iterrows():
-        account = str(row[account_col]).strip()
-        if not account:
-            continue
+    accounts = strip_text(transactions_df[account_col])
+    mask = (accounts != "").to_numpy()
 
-        debit = to_float(row[debit_col])
-        credit = to_float(row[credit_col])
+    debit_arr = to_float_series(transactions_df[debit_col]).to_numpy()[mask]
+    credit_arr = to_float_series(transactions_df[credit_col]).to_numpy()[mask]
 
-        trace_info = {
-            "科目": account,
-            "借方": debit,
-            "贷方": credit,
-            "净影响": debit - credit
-        }
+    trace_df = pd.DataFrame({
+        "科目": accounts.to_numpy(dtype=object)[mask],
+        "借方": debit_arr,
+        "贷方": credit_arr,
+        "净影响": debit_arr - credit_arr
+    })
 
-        if date_col and date_col in row:
-            trace_info["日期"] = row[date_col]
-        if voucher_col and voucher_col in row:
-            trace_info["凭证号"] = str(row[voucher_col])
+    if date_col and date_col in transactions_df.columns:
+        trace_df["日期"] = transactions_df[date_col][mask].tolist()
+    if voucher_col and voucher_col in transactions_df.columns:
+        trace_df["凭证号"] = transactions_df[voucher_col][mask].fillna("nan").astype(str).tolist()
 
-        trace_list.append(trace_info)
-
-    return trace_list
+    return trace_df.to_dict("records")
 
 
 # ============================================================================
 # 报告生成
 # ============================================================================
 
-def generate_account_analysis(accounts: List[AccountBalance]) -> pd.DataFrame:
-    """生成科目变动分析表"""
-    data = []
-    for acc in accounts:
-        data.append({
-            "科目": acc.account,
-            "科目类型": acc.account_type.value,
-            "期初余额": acc.opening_balance,
-            "借方变动": acc.debit_change,
-            "贷方变动": acc.credit_change,
-            "净变动": acc.debit_change - acc.credit_change,
-            "期末余额": acc.closing_balance,
-            "是否平衡": "是" if acc.is_balanced else "否",
-            "差异": acc.diff
-        })
+# 导出数据总行数达到该值时，多进程并行写入各工作表
+PARALLEL_EXPORT_MIN_ROWS = 50000
+
 
-    return pd.DataFrame(data)
+def generate_account_analysis(
+    accounts: Union[AccountBalanceFrame, List[AccountBalance]]
+) -> pd.DataFrame:
+    """生成科目变动分析表"""
+    if not isinstance(accounts, AccountBalanceFrame):
+        accounts = AccountBalanceFrame.from_balances(list(accounts))
+
+    return pd.DataFrame({
+        "科目": accounts.account,
+        "科目类型": accounts.account_type,
+        "期初余额": accounts.opening_balance,
+        "借方变动": accounts.debit_change,
+        "贷方变动": accounts.credit_change,
+        "净变动": accounts.debit_change - accounts.credit_change,
+        "期末余额": accounts.closing_balance,
+        "是否平衡": np.where(accounts.is_balanced, "是", "否"),
+        "差异": accounts.diff
+    })
 
 
 def generate_audit_report(
@@ -557,34 +891,143 @@ def generate_audit_report(
 def export_audit_report(
     result: AuditResult,
     output_file: Union[str, Path],
-    accounts: List[AccountBalance],
+    accounts: Union[AccountBalanceFrame, List[AccountBalance]],
     period: str = "本期"
 ) -> None:
-    """导出完整的 Excel 审计报告"""
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        # 审计报告文本
-        report_text = generate_audit_report(result, period)
-        report_df = pd.DataFrame({'审计报告': [report_text]})
-        report_df.to_excel(writer, sheet_name='审计报告', index=False)
+    """
+    导出完整的 Excel 审计报告
 
+    安装了 xlsxwriter 时以 constant_memory 模式逐行写入，已写完的行直接
+    刷到磁盘，不在内存中保留整张表；否则使用 openpyxl 写入
+    """
+    # 审计报告文本
+    report_text = generate_audit_report(result, period)
+    sheets = [
+        ('审计报告', pd.DataFrame({'审计报告': [report_text]})),
         # 科目变动分析表
-        account_analysis = generate_account_analysis(accounts)
-        account_analysis.to_excel(writer, sheet_name='科目变动分析', index=False)
+        ('科目变动分析', generate_account_analysis(accounts)),
+    ]
+
+    # 交易影响追踪
+    if result.transaction_trace:
+        sheets.append(('交易影响追踪', pd.DataFrame(result.transaction_trace)))
 
-        # 交易影响追踪
-        if result.transaction_trace:
-            trace_df = pd.DataFrame(result.transaction_trace)
-            trace_df.to_excel(writer, sheet_name='交易影响追踪', index=False)
+    # 利润表项目核对
+    if result.income_statement_check.get('items'):
+        sheets.append(('利润表核对', pd.DataFrame(result.income_statement_check['items'])))
 
-        # 利润表项目核对
-        if result.income_statement_check.get('items'):
-            income_df = pd.DataFrame(result.income_statement_check['items'])
-            income_df.to_excel(writer, sheet_name='利润表核对', index=False)
+    # 不平衡项清单
+    if result.unbalanced_items:
+        sheets.append(('不平衡项', pd.DataFrame(result.unbalanced_items)))
+
+    if XLSXWRITER_AVAILABLE and sum(len(df) for _, df in sheets) >= PARALLEL_EXPORT_MIN_ROWS:
+        write_sheets_parallel(sheets, output_file)
+    elif XLSXWRITER_AVAILABLE:
+        with xlsxwriter.Workbook(str(output_file), {'constant_memory': True}) as workbook:
+            for sheet_name, df in sheets:
+                write_sheet_rows(workbook, sheet_name, df)
+    else:
+        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            for sheet_name, df in sheets:
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
 
-        # 不平衡项清单
-        if result.unbalanced_items:
-            unbalanced_df = pd.DataFrame(result.unbalanced_items)
-            unbalanced_df.to_excel(writer, sheet_name='不平衡项', index=False)
+
+def write_sheet_rows(workbook: Any, sheet_name: str, df: pd.DataFrame) -> None:
+    """
+    按行顺序将 DataFrame 写入 xlsxwriter 工作表
+
+    constant_memory 模式只接受按行递增的写入，而 DataFrame.to_excel 按列写入
+    单元格，因此逐行写入；表头样式和空值处理与 to_excel 保持一致
+    """
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+
+    worksheet = workbook.add_worksheet(sheet_name)
+    for col, name in enumerate(df.columns):
+        worksheet.write(0, col, name, header_format)
+
+    for row, values in enumerate(df.itertuples(index=False, name=None), start=1):
+        for col, value in enumerate(values):
+            if pd.isna(value):
+                continue
+            if isinstance(value, str):
+                # 避免以 "=" 开头的文本被当作公式
+                worksheet.write_string(row, col, value)
+            elif isinstance(value, datetime):
+                worksheet.write_datetime(row, col, value, date_format)
+            else:
+                worksheet.write(row, col, value)
+
+
+def write_sheet_part(sheet_name: str, df: pd.DataFrame, path: Path, placeholder: bool) -> str:
+    """
+    在子进程中将单张工作表写入独立的 xlsx 文件，返回工作表 XML 在包内的路径
+
+    placeholder 为 True 时先添加一张空白占位表，使目标表不处于选中状态
+    """
+    with xlsxwriter.Workbook(str(path), {'constant_memory': True}) as workbook:
+        if placeholder:
+            workbook.add_worksheet()
+        write_sheet_rows(workbook, sheet_name, df)
+    return "xl/worksheets/sheet2.xml" if placeholder else "xl/worksheets/sheet1.xml"
+
+
+def write_sheets_parallel(
+    sheets: List[Tuple[str, pd.DataFrame]],
+    output_file: Union[str, Path],
+    max_workers: Optional[int] = None
+) -> None:
+    """
+    多进程并行写入各工作表，再拼接为一个 xlsx 文件
+
+    constant_memory 模式下字符串以内联方式写入，工作表 XML 不依赖共享字符串表，
+    因此主进程以只含空表的工作簿为骨架，直接替换其中的工作表 XML。
+    write_sheet_rows 总是先使用表头样式、再使用日期样式，各文件的样式编号一致，
+    取样式最全的 styles.xml 即可
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        parts = [tmp / f"part{i}.xlsx" for i in range(len(sheets))]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            members = list(executor.map(
+                write_sheet_part,
+                [sheet_name for sheet_name, _ in sheets],
+                [df for _, df in sheets],
+                parts,
+                [i > 0 for i in range(len(sheets))]
+            ))
+
+        skeleton = tmp / "skeleton.xlsx"
+        with xlsxwriter.Workbook(str(skeleton), {'constant_memory': True}) as workbook:
+            for sheet_name, _ in sheets:
+                workbook.add_worksheet(sheet_name)
+
+        # 骨架中的成员 -> (来源文件, 来源成员)
+        sources = {
+            f"xl/worksheets/sheet{i}.xml": (part, member)
+            for i, (part, member) in enumerate(zip(parts, members), start=1)
+        }
+        styles_count = -1
+        for part in parts:
+            with zipfile.ZipFile(part) as zf:
+                match = re.search(rb'<cellXfs count="(\d+)"', zf.read("xl/styles.xml"))
+            count = int(match.group(1)) if match else 0
+            if count > styles_count:
+                styles_count = count
+                sources["xl/styles.xml"] = (part, "xl/styles.xml")
+
+        with zipfile.ZipFile(skeleton) as src, zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                part, member = sources.get(info.filename, (None, None))
+                target = zipfile.ZipInfo(info.filename, info.date_time)
+                target.compress_type = zipfile.ZIP_DEFLATED
+                with dst.open(target, "w") as out:
+                    if part is None:
+                        out.write(src.read(info.filename))
+                    else:
+                        with zipfile.ZipFile(part) as zf, zf.open(member) as data:
+                            shutil.copyfileobj(data, out)
 
 
 # ============================================================================
@@ -608,8 +1051,13 @@ def audit_financial_statements(
 
     # 其他配置
     tolerance: float = 0.01,
-    period: str = "本期"
-) -> Tuple[AuditResult, List[AccountBalance]]:
+    period: str = "本期",
+
+    # Sheet 与计算后端配置（仅限关键字参数）
+    *,
+    sheet_names: Optional[Dict[str, Union[str, int]]] = None,
+    backend: str = "pandas"
+) -> Tuple[AuditResult, AccountBalanceFrame]:
     """
     执行完整的财务报表审计
 
@@ -626,9 +1074,13 @@ def audit_financial_statements(
         transactions_config: 交易明细表列名配置
         tolerance: 容忍误差
         period: 审计期间
+        sheet_names: 各文件的 sheet 名称或索引，键为 balance_sheet /
+            account_changes / income_statement / income_details / transactions，
+            未指定时读取第一个 sheet
+        backend: 资产负债表科目校验的计算后端，pandas 或 polars
 
     Returns:
-        (审计结果, 科目余额列表)
+        (审计结果, 科目余额表)
     """
     # 默认列名配置
     if balance_sheet_config is None:
@@ -666,16 +1118,37 @@ def audit_financial_statements(
 
     result = AuditResult()
 
-    # 1. 读取资产负债表
-    bs_df = read_excel_file(balance_sheet_file)
-    balance_sheet = parse_balance_sheet(
-        bs_df,
-        balance_sheet_config["account"],
-        balance_sheet_config["opening"],
-        balance_sheet_config["closing"]
-    )
-
-    # 验证资产负债表平衡
+    # 0. 并行读取所有报表（同一工作簿只打开一次）
+    sheets = sheet_names or {}
+    sources = {
+        "balance_sheet": (balance_sheet_file, sheets.get("balance_sheet", 0)),
+        "account_changes": (account_changes_file, sheets.get("account_changes", 0)),
+    }
+    if income_statement_file:
+        sources["income_statement"] = (income_statement_file, sheets.get("income_statement", 0))
+        if income_details_file:
+            sources["income_details"] = (income_details_file, sheets.get("income_details", 0))
+    if transactions_file:
+        sources["transactions"] = (transactions_file, sheets.get("transactions", 0))
+
+    frames = read_excel_files(sources)
+    bs_df = frames["balance_sheet"]
+    changes_df = frames["account_changes"]
+    income_df = frames.get("income_statement")
+    details_df = frames.get("income_details")
+    trans_df = frames.get("transactions")
+
+    # 科目、类型、项目列转为分类类型：减少内存，分组和比较基于整数编码
+    categorize_columns(bs_df, [balance_sheet_config["account"], balance_sheet_config.get("type", "类型")])
+    categorize_columns(changes_df, [account_changes_config["account"]])
+    if income_df is not None:
+        categorize_columns(income_df, [income_statement_config["item"]])
+    if details_df is not None:
+        categorize_columns(details_df, [income_details_config["item"]])
+    if trans_df is not None:
+        categorize_columns(trans_df, [transactions_config["account"]])
+
+    # 1. 验证资产负债表平衡
     bs_check = verify_balance_sheet_total(
         bs_df,
         balance_sheet_config.get("type", "类型"),
@@ -683,31 +1156,50 @@ def audit_financial_statements(
     )
     result.balance_sheet_check = bs_check
 
-    # 2. 读取科目变动明细
-    changes_df = read_excel_file(account_changes_file)
-    account_changes = parse_account_changes(
-        changes_df,
-        account_changes_config["account"],
-        account_changes_config["debit"],
-        account_changes_config["credit"]
-    )
+    if backend == "polars":
+        # 2-3. 解析资产负债表、科目变动明细并验证每个科目余额（单个惰性查询）
+        accounts = validate_balance_sheet_polars(
+            bs_df,
+            changes_df,
+            balance_sheet_config["account"],
+            balance_sheet_config["opening"],
+            balance_sheet_config["closing"],
+            account_changes_config["account"],
+            account_changes_config["debit"],
+            account_changes_config["credit"],
+            tolerance
+        )
+    elif backend == "pandas":
+        # 2. 解析资产负债表和科目变动明细
+        balance_sheet = parse_balance_sheet(
+            bs_df,
+            balance_sheet_config["account"],
+            balance_sheet_config["opening"],
+            balance_sheet_config["closing"]
+        )
+        account_changes = parse_account_changes(
+            changes_df,
+            account_changes_config["account"],
+            account_changes_config["debit"],
+            account_changes_config["credit"]
+        )
 
-    # 3. 验证每个科目余额
-    accounts = validate_balance_sheet(balance_sheet, account_changes, tolerance)
+        # 3. 验证每个科目余额
+        accounts = validate_balance_sheet(balance_sheet, account_changes, tolerance)
+    else:
+        raise ValueError(f"不支持的计算后端: {backend}")
 
     # 收集不平衡项目
-    for acc in accounts:
-        if not acc.is_balanced:
-            result.unbalanced_items.append({
-                "科目": acc.account,
-                "类型": "资产负债表科目",
-                "差异": acc.diff
-            })
+    for i in np.flatnonzero(~accounts.is_balanced):
+        result.unbalanced_items.append({
+            "科目": accounts.account[i],
+            "类型": "资产负债表科目",
+            "差异": float(accounts.diff[i])
+        })
 
     # 4. 利润表审计（如果提供）
     net_profit = 0.0
-    if income_statement_file:
-        income_df = read_excel_file(income_statement_file)
+    if income_df is not None:
         income_items = parse_income_statement(
             income_df,
             income_statement_config["item"],
@@ -721,8 +1213,7 @@ def audit_financial_statements(
         )
 
         # 如果有明细表，进行核对
-        if income_details_file:
-            details_df = read_excel_file(income_details_file)
+        if details_df is not None:
             verification = verify_income_statement_with_details(
                 income_items,
                 details_df,
@@ -749,12 +1240,11 @@ def audit_financial_statements(
             }
 
     # 5. 报表勾稽关系验证
-    cross_validation = verify_cross_validation(balance_sheet, net_profit, tolerance)
+    cross_validation = verify_cross_validation(accounts, net_profit, tolerance)
     result.cross_validation = cross_validation
 
     # 6. 交易影响追踪（如果提供）
-    if transactions_file:
-        trans_df = read_excel_file(transactions_file)
+    if trans_df is not None:
         result.transaction_trace = trace_transaction_impact(
             trans_df,
             transactions_config["account"],
@@ -767,7 +1257,7 @@ def audit_financial_statements(
     # 7. 汇总结果
     result.is_passed = (
         bs_check.get("is_balanced", False) and
-        not any(not acc.is_balanced for acc in accounts) and
+        bool(accounts.is_balanced.all()) and
         not result.unbalanced_items
     )
 
@@ -801,6 +1291,8 @@ def main():
     parser.add_argument('--is-sheet', help='利润表 sheet 名称或索引')
     parser.add_argument('--id-sheet', help='利润明细表 sheet 名称或索引')
     parser.add_argument('--trans-sheet', help='交易明细表 sheet 名称或索引')
+    parser.add_argument('--backend', choices=['pandas', 'polars'], default='pandas',
+                        help='科目余额校验的计算后端（polars 需要安装 polars）')
 
     args = parser.parse_args()
 
@@ -810,6 +1302,20 @@ def main():
         with open(args.config, 'r', encoding='utf-8') as f:
             config = json.load(f)
 
+    # Sheet 参数：纯数字视为索引，否则视为名称
+    sheet_args = {
+        "balance_sheet": args.bs_sheet,
+        "account_changes": args.ac_sheet,
+        "income_statement": args.is_sheet,
+        "income_details": args.id_sheet,
+        "transactions": args.trans_sheet,
+    }
+    sheet_names = {
+        key: int(value) if value.isdigit() else value
+        for key, value in sheet_args.items()
+        if value is not None
+    }
+
     result, accounts = audit_financial_statements(
         balance_sheet_file=args.balance_sheet,
         account_changes_file=args.account_changes,
@@ -821,8 +1327,10 @@ def main():
         income_statement_config=config.get('income_statement'),
         income_details_config=config.get('income_details'),
         transactions_config=config.get('transactions'),
+        sheet_names=sheet_names,
         tolerance=args.tolerance,
-        period=args.period
+        period=args.period,
+        backend=args.backend
     )
 
     # 打印审计报告
@@ -0,0 +1,141 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import reconcile
+
+
+def balance_sheet_df():
+    """资产负债表：含空科目行、小计行、重复科目"""
+    return pd.DataFrame({
+        "科目": ["货币资金", np.nan, " 应收账款 ", "小计", "货币资金"],
+        "期初余额": [100.0, 5.0, 50.0, 155.0, 110.0],
+        "期末余额": [120.0, 5.0, 60.0, 185.0, 130.0],
+    })
+
+
+def changes_df():
+    """科目变动明细表：含空科目行和空凭证号"""
+    return pd.DataFrame({
+        "科目": ["货币资金", np.nan, "应收账款", "货币资金"],
+        "借方": [10.0, 1.0, 10.0, 5.0],
+        "贷方": [0.0, 1.0, np.nan, 5.0],
+        "凭证号": ["V001", "V002", np.nan, "V004"],
+    })
+
+
+def reference_account_changes(df):
+    """原先逐行 iterrows 的科目变动解析"""
+    changes = {}
+    for _, row in df.iterrows():
+        account = str(row["科目"]).strip()
+        if not account:
+            continue
+        debit = reconcile.to_float(row["借方"])
+        credit = reconcile.to_float(row["贷方"])
+        if account in changes:
+            changes[account] = (changes[account][0] + debit, changes[account][1] + credit)
+        else:
+            changes[account] = (debit, credit)
+    return changes
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestMissingText(unittest.TestCase):
+    """空单元格与原先逐行 str() 转换的结果一致，记为 "nan" 而不是被丢弃"""
+
+    def test_strip_text(self):
+        for series in [
+            pd.Series([" a ", np.nan]),
+            pd.Series([" a ", None], dtype=object),
+            pd.Series([" a ", np.nan]).astype("category"),
+        ]:
+            with self.subTest(dtype=str(series.dtype)):
+                self.assertEqual(reconcile.strip_text(series).tolist(), ["a", "nan"])
+
+    def test_balance_sheet_keeps_missing_account(self):
+        accounts = [balance.account for balance in reconcile.parse_balance_sheet(balance_sheet_df())]
+        self.assertEqual(accounts, ["货币资金", "nan", "应收账款"])
+
+    def test_account_changes_match_reference(self):
+        df = changes_df()
+        changes = reconcile.parse_account_changes(df)
+        self.assertIn("nan", changes)
+        self.assertEqual(changes, reference_account_changes(df))
+
+    def test_trace_keeps_missing_account_and_voucher(self):
+        trace = reconcile.trace_transaction_impact(changes_df())
+        self.assertEqual([row["科目"] for row in trace], ["货币资金", "nan", "应收账款", "货币资金"])
+        self.assertEqual([row["凭证号"] for row in trace], ["V001", "V002", "nan", "V004"])
+
+    @unittest.skipUnless(reconcile.POLARS_AVAILABLE, "需要 polars")
+    def test_polars_matches_pandas(self):
+        expected = reconcile.validate_balance_sheet(
+            reconcile.parse_balance_sheet(balance_sheet_df()),
+            reconcile.parse_account_changes(changes_df())
+        )
+        result = reconcile.validate_balance_sheet_polars(balance_sheet_df(), changes_df())
+        self.assertEqual(list(result), list(expected))
+
+
+def audit_result():
+    """含各类单元格（文本、公式样文本、日期、空值、布尔）的审计结果"""
+    accounts = reconcile.validate_balance_sheet(
+        reconcile.parse_balance_sheet(balance_sheet_df()),
+        reconcile.parse_account_changes(changes_df())
+    )
+    trace = reconcile.trace_transaction_impact(changes_df())
+    for i, row in enumerate(trace):
+        row["日期"] = datetime(2024, 1, i + 1, 9, 30)
+    trace[0]["凭证号"] = "=SUM(A1:A2)"
+    trace[1]["日期"] = pd.NaT
+    items = [
+        {"项目": "营业收入", "利润表金额": 1000.0, "明细表金额": 1000.0, "差异": 0.0, "是否匹配": True, "增加利润": True},
+        {"项目": "营业成本", "利润表金额": 400.0, "明细表金额": 390.5, "差异": 9.5, "是否匹配": False, "增加利润": False},
+    ]
+    result = reconcile.AuditResult(
+        is_passed=False,
+        balance_sheet_check={"total_accounts": len(accounts), "balanced_count": 1, "unbalanced_count": len(accounts) - 1},
+        income_statement_check={"items": items, "matched_count": 1, "total_items": 2},
+        transaction_trace=trace,
+        unbalanced_items=[{"科目": "货币资金", "差异": 20.0}, {"科目": "nan", "差异": np.nan}],
+    )
+    return result, accounts
+
+
+@unittest.skipUnless(reconcile.XLSXWRITER_AVAILABLE, "需要 xlsxwriter")
+class TestParallelExport(unittest.TestCase):
+    """多进程拼接的报告与单个 xlsxwriter 工作簿逐行写入的报告内容一致"""
+
+    def export(self, path, min_rows):
+        result, accounts = audit_result()
+        with mock.patch.object(reconcile, "PARALLEL_EXPORT_MIN_ROWS", min_rows), \
+                mock.patch.object(reconcile, "write_sheets_parallel", wraps=reconcile.write_sheets_parallel) as parallel:
+            reconcile.export_audit_report(result, path, accounts)
+        return parallel.called
+
+    def test_parallel_export_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            serial_path = Path(tmp) / "serial.xlsx"
+            parallel_path = Path(tmp) / "parallel.xlsx"
+            self.assertFalse(self.export(serial_path, min_rows=10 ** 9))
+            self.assertTrue(self.export(parallel_path, min_rows=0))
+
+            serial = pd.read_excel(serial_path, sheet_name=None)
+            parallel = pd.read_excel(parallel_path, sheet_name=None)
+
+        self.assertEqual(list(parallel), list(serial))
+        self.assertEqual(list(serial), ["审计报告", "科目变动分析", "交易影响追踪", "利润表核对", "不平衡项"])
+        for sheet_name, df in serial.items():
+            with self.subTest(sheet=sheet_name):
+                pd.testing.assert_frame_equal(parallel[sheet_name], df)
+        self.assertEqual(serial["交易影响追踪"]["凭证号"][0], "=SUM(A1:A2)")
+
+
+if __name__ == "__main__":
+    unittest.main()
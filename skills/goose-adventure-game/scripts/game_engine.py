@@ -13,38 +13,177 @@ Text Adventure Game Engine for "The Wonderful Adventures of Nils"
 - 物品栏管理
 """
 
+import bisect
 import json
 import os
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-from datetime import datetime
-
-
-@dataclass
-class GameState:
+import sys
+from collections import deque
+from typing import Callable, Deque, Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# JSON 读写和时间戳缓存与 SaveManager 共用同一份实现（写入先落临时文件再替换）；
+# 既支持 scripts 包内导入，也支持把 scripts 目录加入 sys.path 后直接导入
+try:
+    from .save_manager import SAVE_INDEX_FILE, _fast_iso_now, read_json, write_json
+except ImportError:
+    from save_manager import SAVE_INDEX_FILE, _fast_iso_now, read_json, write_json
+
+# Python 3.10 起 dataclass 支持 __slots__，实例不再携带 __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 存档中原样保存的状态字段
+_STATE_FIELDS = ("current_scene", "hp", "morality", "size", "knowledge", "achievements")
+
+# 历史记录最多保留的条数，超出后丢弃最早的记录
+HISTORY_LIMIT = 500
+
+# 引擎自己的存档索引文件，与 SaveManager 的索引分开，互不覆盖；
+# 后缀不是 .json，不会被当作存档列出
+ENGINE_INDEX_FILE = "engine_saves.index"
+
+# 知识成就阈值（升序）及对应成就名
+_TIER_KEYS = (100, 300, 500, 800)
+_TIER_NAMES = ("自然观察者", "小小博物学家", "地理大师", "智慧之星")
+
+# 编译后的条件数组每行依次为：
+# 物品编号、标志位序号、标志值、道德下限、道德上限、大小下限、大小上限、成就编号
+# 标志值为 1/0 时要求标志已设置且值相同，为 _FLAG_UNSET 时要求标志未设置
+_REQ_NONE = -1
+_FLAG_UNSET = -1
+_REQ_LOW = -(1 << 62)
+_REQ_HIGH = 1 << 62
+_MASK_BITS = 63  # int64 位掩码可容纳的位数
+
+# 选项/结局条数达到该值才编译为数组交给 numba 批量检查；
+# 条数少时调度与分配数组的开销高于逐项调用生成的检查函数
+BATCH_CHECK_MIN_ROWS = 32
+
+# 数值范围条件 -> (状态属性, 不满足时的比较运算符)
+_RANGE_CHECKS = (
+    ("morality_min", "morality", "<"),
+    ("morality_max", "morality", ">"),
+    ("size_min", "size", "<"),
+    ("size_max", "size", ">"),
+)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _check_all(req, inv_mask, ach_mask, flag_set_mask, flag_mask, morality, size, out):
+        """一次检查场景内所有选项的编译条件，结果写入 out"""
+        for i in range(req.shape[0]):
+            ok = True
+            if req[i, 0] >= 0 and ((inv_mask >> req[i, 0]) & 1) == 0:
+                ok = False
+            elif req[i, 1] >= 0 and (
+                ((flag_set_mask >> req[i, 1]) & 1) != (1 if req[i, 2] >= 0 else 0)
+                or ((flag_mask >> req[i, 1]) & 1) != (1 if req[i, 2] == 1 else 0)
+            ):
+                ok = False
+            elif morality < req[i, 3] or morality > req[i, 4]:
+                ok = False
+            elif size < req[i, 5] or size > req[i, 6]:
+                ok = False
+            elif req[i, 7] >= 0 and ((ach_mask >> req[i, 7]) & 1) == 0:
+                ok = False
+            out[i] = ok
+
+
+def _ALWAYS_TRUE(state: "GameState") -> bool:
+    """无条件选项的检查函数"""
+    return True
+
+
+def intern_name(ids: Dict[str, int], name: str) -> int:
+    """返回名称在编号表中的编号，未编号的名称分配新编号"""
+    index = ids.get(name)
+    if index is None:
+        index = ids[name] = len(ids)
+    return index
+
+
+class _GameStateIndex:
+    """GameState 中不参与序列化的属性：物品/成就编号表及位掩码"""
+    __slots__ = ("_item_ids", "_achievement_ids", "inventory_mask", "achievements_mask")
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class GameState(_GameStateIndex):
     """游戏状态数据类"""
     current_scene: str = "start"  # 当前场景ID
     hp: int = 100  # 生命值 (0-100)
     morality: int = 50  # 道德值 (0-100, 低=自私, 高=善良)
     size: int = 10  # 大小值 (0-100, 小=拇指大小, 大=正常)
     knowledge: int = 0  # 知识值 (0-1000)
-    inventory: List[str] = None  # 物品栏
+    inventory: Dict[str, None] = None  # 物品栏（按获得顺序的有序集合）
     achievements: List[str] = None  # 成就列表
-    flags: Dict[str, bool] = None  # 事件标志
-    history: List[str] = None  # 历史记录
+    flags_mask: int = 0  # 事件标志值位（位由引擎按标志名分配，未设置的标志为 0）
+    flags_set_mask: int = 0  # 已设置的标志位（含值为 False 的标志）
+    history: Deque[str] = None  # 历史记录（只保留最近 HISTORY_LIMIT 条）
 
     def __post_init__(self):
-        if self.inventory is None:
-            self.inventory = []
+        # 存档中物品栏保存为列表，加载时转换为有序集合
+        self.inventory = dict.fromkeys(self.inventory or ())
         if self.achievements is None:
             self.achievements = []
-        if self.flags is None:
-            self.flags = {}
-        if self.history is None:
-            self.history = []
+        # 存档中历史记录保存为列表，加载时转换为定长队列
+        self.history = deque(self.history or (), maxlen=HISTORY_LIMIT)
+        self.bind_names({}, {})
 
+    def bind_names(self, item_ids: Dict[str, int], achievement_ids: Dict[str, int]):
+        """
+        绑定物品与成就的编号表（由引擎加载剧本时生成），并重建位掩码
 
-@dataclass
+        位掩码用于 O(1) 成员检查，列表保留获得顺序并用于序列化
+        """
+        self._item_ids = item_ids
+        self._achievement_ids = achievement_ids
+        self.inventory_mask = 0
+        for item in self.inventory:
+            self.inventory_mask |= 1 << intern_name(item_ids, item)
+        self.achievements_mask = 0
+        for achievement in self.achievements:
+            self.achievements_mask |= 1 << intern_name(achievement_ids, achievement)
+
+    def add_item(self, item: str):
+        """添加物品（已有则忽略）"""
+        bit = 1 << intern_name(self._item_ids, item)
+        if not self.inventory_mask & bit:
+            self.inventory_mask |= bit
+            self.inventory[item] = None
+
+    def remove_item(self, item: str):
+        """移除物品（没有则忽略）"""
+        if self.has_item(item):
+            self.inventory_mask &= ~(1 << self._item_ids[item])
+            del self.inventory[item]
+
+    def has_item(self, item: str) -> bool:
+        """是否持有物品"""
+        index = self._item_ids.get(item)
+        return index is not None and bool((self.inventory_mask >> index) & 1)
+
+    def add_achievement(self, achievement: str):
+        """添加成就（已有则忽略）"""
+        bit = 1 << intern_name(self._achievement_ids, achievement)
+        if not self.achievements_mask & bit:
+            self.achievements_mask |= bit
+            self.achievements.append(achievement)
+
+    def has_achievement(self, achievement: str) -> bool:
+        """是否已获得成就"""
+        index = self._achievement_ids.get(achievement)
+        return index is not None and bool((self.achievements_mask >> index) & 1)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Choice:
     """选项数据类"""
     text: str  # 选项显示文本
@@ -53,9 +192,11 @@ class Choice:
     effects: Optional[Dict[str, Any]] = None  # 选择后的效果
     moral_change: Optional[int] = None  # 道德值变化
     knowledge_gain: Optional[int] = None  # 知识值获得
+    # 加载时由条件生成的检查函数 (GameState) -> bool
+    _compiled_check: Callable[["GameState"], bool] = field(default=_ALWAYS_TRUE, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Scene:
     """场景数据类"""
     id: str  # 场景ID
@@ -65,6 +206,8 @@ class Scene:
     image_prompt: Optional[str] = None  # 配图提示
     music: Optional[str] = None  # 背景音乐
     narrator: Optional[str] = None  # 旁白风格
+    # 所有选项都没有条件时为全部选项，否则为 None
+    _always_available: Optional[Tuple[Choice, ...]] = field(default=None, repr=False, compare=False)
 
 
 class GameEngine:
@@ -80,23 +223,58 @@ class GameEngine:
         """
         self.script = script_data
         self.save_dir = save_dir
-        self.state = GameState()
         self.scenes: Dict[str, Scene] = {}
+        self._knowledge_tier = 0  # 已检查过的知识成就档位数
+        self._state_version = 0  # 状态版本号，状态变化时递增
+        self._choices_cache: Optional[tuple] = None  # (场景ID, 状态版本号, 可用选项)
+        self._flag_bits: Dict[str, int] = {}  # 标志名 -> 标志位
+        self._item_ids: Dict[str, int] = {}  # 物品名 -> 编号
+        self._achievement_ids: Dict[str, int] = {}  # 成就名 -> 编号
+        self._compiled_requirements: Dict[str, Any] = {}  # 场景ID -> 编译后的条件数组
+        self.state = GameState()
         self._load_scenes()
+        self._load_endings()
+
+    @property
+    def state(self) -> GameState:
+        """当前游戏状态"""
+        return self._state
+
+    @state.setter
+    def state(self, state: GameState):
+        # 新状态共用引擎的物品/成就编号表
+        state.bind_names(self._item_ids, self._achievement_ids)
+        self._state = state
+        self._knowledge_tier = 0
+        self.invalidate_choices()
 
     def _load_scenes(self):
         """加载场景数据"""
+        # 剧本中出现的标志、物品、成就在加载时统一编号
+        for name in _TIER_NAMES:
+            intern_name(self._achievement_ids, name)
+        for ending in self.script.get("endings", []):
+            self._register_names(ending.get("requirements"), None)
+
         for scene_data in self.script.get("scenes", []):
             choices = []
             for choice_data in scene_data.get("choices", []):
+                self._register_names(choice_data.get("requirements"), choice_data.get("effects"))
                 choices.append(Choice(
                     text=choice_data["text"],
                     next_scene=choice_data["next_scene"],
                     requirements=choice_data.get("requirements"),
                     effects=choice_data.get("effects"),
                     moral_change=choice_data.get("moral_change"),
-                    knowledge_gain=choice_data.get("knowledge_gain")
+                    knowledge_gain=choice_data.get("knowledge_gain"),
+                    _compiled_check=self._compile_check(choice_data.get("requirements"))
                 ))
+            if NUMBA_AVAILABLE and len(choices) >= BATCH_CHECK_MIN_ROWS \
+                    and any(choice.requirements for choice in choices):
+                compiled = self._compile_requirements([choice.requirements for choice in choices])
+                if compiled is not None:
+                    self._compiled_requirements[scene_data["id"]] = compiled
+
             self.scenes[scene_data["id"]] = Scene(
                 id=scene_data["id"],
                 title=scene_data["title"],
@@ -104,64 +282,215 @@ class GameEngine:
                 choices=choices,
                 image_prompt=scene_data.get("image_prompt"),
                 music=scene_data.get("music"),
-                narrator=scene_data.get("narrator")
+                narrator=scene_data.get("narrator"),
+                _always_available=None if any(choice.requirements for choice in choices) else tuple(choices)
             )
 
-    def get_current_scene(self) -> Optional[Scene]:
-        """获取当前场景"""
-        return self.scenes.get(self.state.current_scene)
+    def _load_endings(self):
+        """
+        预处理结局数据
 
-    def get_available_choices(self) -> List[Choice]:
-        """获取当前可用的选项"""
-        scene = self.get_current_scene()
-        if not scene:
-            return []
+        有条件的结局按原顺序保存（条数足够多时再编译条件数组），三个默认结局按道德值档位缓存
+        """
+        endings = self.script.get("endings", [])
+        self._conditional_endings = [ending for ending in endings if ending.get("requirements")]
+        self._ending_checks = [self._compile_check(ending["requirements"]) for ending in self._conditional_endings]
+        self._compiled_endings = None
+        if NUMBA_AVAILABLE and len(self._conditional_endings) >= BATCH_CHECK_MIN_ROWS:
+            self._compiled_endings = self._compile_requirements(
+                [ending["requirements"] for ending in self._conditional_endings]
+            )
 
-        available = []
-        for choice in scene.choices:
-            if self._check_requirements(choice.requirements):
-                available.append(choice)
-        return available
+        fallbacks = (
+            {"title": "完美结局", "description": "你成长为了一个善良、勇敢的人"},
+            {"title": "普通结局", "description": "你学到了很多，但还有进步空间"},
+            {"title": "需要改进", "description": "你还需要学会关心他人"}
+        )
+        self._default_endings = tuple(
+            endings[i] if len(endings) > i else fallback for i, fallback in enumerate(fallbacks)
+        )
 
-    def _check_requirements(self, requirements: Optional[Dict]) -> bool:
-        """检查选项是否满足触发条件"""
+    def _compile_requirements(self, requirements_list: List[Optional[Dict]]) -> Optional[Any]:
+        """
+        将一个场景所有选项的条件编译为 int64 数组，供 _check_all 批量检查
+
+        条件中含有非整数阈值或位数超出 int64 时返回 None，该场景使用逐项检查
+        """
+        rows = []
+        for requirements in requirements_list:
+            requirements = requirements or {}
+            row = [_REQ_NONE, _REQ_NONE, 0, _REQ_LOW, _REQ_HIGH, _REQ_LOW, _REQ_HIGH, _REQ_NONE]
+            if "has_item" in requirements:
+                row[0] = intern_name(self._item_ids, requirements["has_item"])
+            if "flag" in requirements:
+                flag_name, flag_value = requirements["flag"]
+                row[1] = self._flag_bit(flag_name).bit_length() - 1
+                row[2] = _FLAG_UNSET if flag_value is None else int(bool(flag_value))
+            for col, key in ((3, "morality_min"), (4, "morality_max"), (5, "size_min"), (6, "size_max")):
+                if key in requirements:
+                    value = requirements[key]
+                    if not isinstance(value, int) or isinstance(value, bool):
+                        return None
+                    row[col] = value
+            if "has_achievement" in requirements:
+                row[7] = intern_name(self._achievement_ids, requirements["has_achievement"])
+            rows.append(row)
+
+        if max(row[0] for row in rows) >= _MASK_BITS or max(row[1] for row in rows) >= _MASK_BITS \
+                or max(row[7] for row in rows) >= _MASK_BITS:
+            return None
+        return np.array(rows, dtype=np.int64)
+
+    def _compile_check(self, requirements: Optional[Dict]) -> Callable[[GameState], bool]:
+        """
+        将条件生成为专用的检查函数，只包含条件中出现的检查项
+
+        物品、成就编号和标志位在生成时确定，阈值以常量绑定进函数的命名空间
+        """
         if not requirements:
-            return True
+            return _ALWAYS_TRUE
 
-        # 检查物品
+        lines = ["def check(s):"]
+        namespace: Dict[str, Any] = {}
         if "has_item" in requirements:
-            if requirements["has_item"] not in self.state.inventory:
-                return False
-
-        # 检查标志
+            index = intern_name(self._item_ids, requirements["has_item"])
+            lines.append(f"    if not (s.inventory_mask >> {index}) & 1: return False")
         if "flag" in requirements:
+            # 与 flags.get(name) != value 一致：None 要求未设置，其余值要求已设置且真假相同
             flag_name, flag_value = requirements["flag"]
-            if self.state.flags.get(flag_name) != flag_value:
-                return False
+            bit = self._flag_bit(flag_name)
+            if flag_value is None:
+                lines.append(f"    if s.flags_set_mask & {bit}: return False")
+            elif flag_value:
+                lines.append(f"    if not s.flags_mask & {bit}: return False")
+            else:
+                lines.append(f"    if not s.flags_set_mask & ~s.flags_mask & {bit}: return False")
+        for key, attr, op in _RANGE_CHECKS:
+            if key in requirements:
+                namespace[key] = requirements[key]
+                lines.append(f"    if s.{attr} {op} {key}: return False")
+        if "has_achievement" in requirements:
+            index = intern_name(self._achievement_ids, requirements["has_achievement"])
+            lines.append(f"    if not (s.achievements_mask >> {index}) & 1: return False")
+        lines.append("    return True")
+
+        exec("\n".join(lines), namespace)
+        return namespace["check"]
+
+    def _register_names(self, requirements: Optional[Dict], effects: Optional[Dict]):
+        """为条件和效果中出现的标志、物品、成就分配编号"""
+        if requirements:
+            if "flag" in requirements:
+                self._flag_bit(requirements["flag"][0])
+            if "has_item" in requirements:
+                intern_name(self._item_ids, requirements["has_item"])
+            if "has_achievement" in requirements:
+                intern_name(self._achievement_ids, requirements["has_achievement"])
+        if effects:
+            for flag in effects.get("set_flag", {}):
+                self._flag_bit(flag)
+            for key in ("add_item", "remove_item"):
+                if key in effects:
+                    intern_name(self._item_ids, effects[key])
+            if "add_achievement" in effects:
+                intern_name(self._achievement_ids, effects["add_achievement"])
+
+    def _flag_bit(self, flag: str) -> int:
+        """获取标志对应的位，未分配时分配新的位"""
+        bit = self._flag_bits.get(flag)
+        if bit is None:
+            bit = 1 << len(self._flag_bits)
+            self._flag_bits[flag] = bit
+        return bit
+
+    def get_flag(self, flag: str) -> Optional[bool]:
+        """读取事件标志，未设置时返回 None"""
+        bit = self._flag_bits.get(flag, 0)
+        if not self.state.flags_set_mask & bit:
+            return None
+        return bool(self.state.flags_mask & bit)
+
+    def set_flag(self, flag: str, value: bool):
+        """设置事件标志（值按真假保存）"""
+        bit = self._flag_bit(flag)
+        self.state.flags_set_mask |= bit
+        if value:
+            self.state.flags_mask |= bit
+        else:
+            self.state.flags_mask &= ~bit
+
+    def _flags_to_dict(self, flags_set_mask: int, flags_mask: int) -> Dict[str, bool]:
+        """已设置的标志转换为 {标志名: 值}，用于存档"""
+        return {flag: bool(flags_mask & bit) for flag, bit in self._flag_bits.items() if flags_set_mask & bit}
+
+    def _flags_from_dict(self, flags: Dict[str, bool]) -> Tuple[int, int]:
+        """由 {标志名: 值} 还原 (已设置标志位, 标志值位)"""
+        flags_set_mask = flags_mask = 0
+        for flag, value in flags.items():
+            bit = self._flag_bit(flag)
+            flags_set_mask |= bit
+            if value:
+                flags_mask |= bit
+        return flags_set_mask, flags_mask
 
-        # 检查数值范围
-        if "morality_min" in requirements:
-            if self.state.morality < requirements["morality_min"]:
-                return False
+    def get_current_scene(self) -> Optional[Scene]:
+        """获取当前场景"""
+        return self.scenes.get(self.state.current_scene)
 
-        if "morality_max" in requirements:
-            if self.state.morality > requirements["morality_max"]:
-                return False
+    def get_available_choices(self) -> Sequence[Choice]:
+        """
+        获取当前可用的选项
 
-        if "size_min" in requirements:
-            if self.state.size < requirements["size_min"]:
-                return False
+        结果按 (场景ID, 状态版本号) 缓存，状态未变化时重复渲染不再重新筛选；
+        选项全部无条件的场景直接返回加载时保存的选项元组。
+        直接修改 self.state 后需调用 invalidate_choices()
+        """
+        cache = self._choices_cache
+        if cache is not None and cache[0] == self.state.current_scene and cache[1] == self._state_version:
+            return cache[2]
 
-        if "size_max" in requirements:
-            if self.state.size > requirements["size_max"]:
-                return False
+        scene = self.get_current_scene()
+        if not scene:
+            return []
+        if scene._always_available is not None:
+            return scene._always_available
 
-        # 检查成就
-        if "has_achievement" in requirements:
-            if requirements["has_achievement"] not in self.state.achievements:
-                return False
+        passed = self._check_compiled(self._compiled_requirements.get(scene.id))
+        if passed is not None:
+            available = [choice for choice, ok in zip(scene.choices, passed) if ok]
+        else:
+            state = self.state
+            available = [choice for choice in scene.choices if choice._compiled_check(state)]
+        self._choices_cache = (self.state.current_scene, self._state_version, available)
+        return available
 
-        return True
+    def _check_compiled(self, compiled: Optional[Any]) -> Optional[Any]:
+        """
+        用编译后的条件数组批量检查当前状态
+
+        Returns:
+            每行是否满足条件的布尔数组；没有编译数组或位掩码超出 int64 时返回 None
+        """
+        state = self.state
+        if compiled is None or max(state.flags_set_mask, state.inventory_mask, state.achievements_mask).bit_length() > _MASK_BITS:
+            return None
+
+        passed = np.empty(len(compiled), dtype=np.bool_)
+        _check_all(
+            compiled,
+            state.inventory_mask,
+            state.achievements_mask,
+            state.flags_set_mask,
+            state.flags_mask,
+            state.morality,
+            state.size,
+            passed
+        )
+        return passed
+
+    def invalidate_choices(self):
+        """状态变化后使可用选项缓存失效"""
+        self._state_version += 1
 
     def make_choice(self, choice_index: int) -> bool:
         """
@@ -197,20 +526,17 @@ class GameEngine:
 
         # 跳转到下一场景
         self.state.current_scene = choice.next_scene
+        self.invalidate_choices()
 
         return True
 
     def _apply_effects(self, effects: Dict):
         """应用选择效果"""
         if "add_item" in effects:
-            item = effects["add_item"]
-            if item not in self.state.inventory:
-                self.state.inventory.append(item)
+            self.state.add_item(effects["add_item"])
 
         if "remove_item" in effects:
-            item = effects["remove_item"]
-            if item in self.state.inventory:
-                self.state.inventory.remove(item)
+            self.state.remove_item(effects["remove_item"])
 
         if "hp_change" in effects:
             self.state.hp = max(0, min(100, self.state.hp + effects["hp_change"]))
@@ -220,26 +546,24 @@ class GameEngine:
 
         if "set_flag" in effects:
             for flag, value in effects["set_flag"].items():
-                self.state.flags[flag] = value
+                self.set_flag(flag, value)
 
         if "add_achievement" in effects:
-            achievement = effects["add_achievement"]
-            if achievement not in self.state.achievements:
-                self.state.achievements.append(achievement)
+            self.state.add_achievement(effects["add_achievement"])
 
         if "game_over" in effects:
             self.state.current_scene = "game_over"
 
+        self.invalidate_choices()
+
     def _check_knowledge_achievements(self):
         """检查知识成就"""
-        if self.state.knowledge >= 100 and "自然观察者" not in self.state.achievements:
-            self.state.achievements.append("自然观察者")
-        if self.state.knowledge >= 300 and "小小博物学家" not in self.state.achievements:
-            self.state.achievements.append("小小博物学家")
-        if self.state.knowledge >= 500 and "地理大师" not in self.state.achievements:
-            self.state.achievements.append("地理大师")
-        if self.state.knowledge >= 800 and "智慧之星" not in self.state.achievements:
-            self.state.achievements.append("智慧之星")
+        tier = bisect.bisect_right(_TIER_KEYS, self.state.knowledge)
+        if tier <= self._knowledge_tier:
+            return
+        for name in _TIER_NAMES[:tier]:
+            self.state.add_achievement(name)
+        self._knowledge_tier = tier
 
     def save_game(self, slot_name: str = "autosave") -> str:
         """
@@ -254,14 +578,20 @@ class GameEngine:
         os.makedirs(self.save_dir, exist_ok=True)
         save_file = os.path.join(self.save_dir, f"{slot_name}.json")
 
+        # 直接引用状态字段，不做 asdict 的递归深拷贝；
+        # 标志位依赖剧本中标志的顺序，存档中仍按标志名保存
+        state = {name: getattr(self.state, name) for name in _STATE_FIELDS}
+        state["inventory"] = list(self.state.inventory)
+        state["history"] = list(self.state.history)
+        state["flags"] = self._flags_to_dict(self.state.flags_set_mask, self.state.flags_mask)
+
         save_data = {
-            "state": asdict(self.state),
-            "timestamp": datetime.now().isoformat(),
+            "state": state,
+            "timestamp": _fast_iso_now(),
             "version": "1.0"
         }
 
-        with open(save_file, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        write_json(save_file, save_data)
 
         return save_file
 
@@ -280,34 +610,79 @@ class GameEngine:
         if not os.path.exists(save_file):
             return False
 
-        with open(save_file, 'r', encoding='utf-8') as f:
-            save_data = json.load(f)
+        save_data = read_json(save_file)
 
-        self.state = GameState(**save_data["state"])
+        state = dict(save_data["state"])
+        flags = state.pop("flags", None) or {}
+        flags_set_mask, flags_mask = self._flags_from_dict(flags)
+        self.state = GameState(**state, flags_mask=flags_mask, flags_set_mask=flags_set_mask)
         return True
 
     def get_save_files(self) -> List[Dict[str, str]]:
-        """获取所有存档文件信息"""
+        """
+        获取所有存档文件信息
+
+        优先使用引擎存档索引中的摘要；索引中没有、或存档文件比索引新的条目才读取文件，
+        并在此时补写索引。保存游戏时不更新索引，每回合的自动保存只写一个文件
+        """
         saves = []
         if not os.path.exists(self.save_dir):
             return saves
 
-        for filename in os.listdir(self.save_dir):
-            if filename.endswith(".json"):
-                save_file = os.path.join(self.save_dir, filename)
+        # 先取索引的修改时间再读索引，期间写入的存档按过期处理
+        try:
+            index_mtime = os.stat(os.path.join(self.save_dir, ENGINE_INDEX_FILE)).st_mtime_ns
+        except OSError:
+            index_mtime = 0
+        index = self._read_save_index()
+        rebuilt = {}
+
+        with os.scandir(self.save_dir) as it:
+            dir_entries = [entry for entry in it if entry.name.endswith(".json") and entry.name != SAVE_INDEX_FILE]
+
+        for dir_entry in dir_entries:
+            name = dir_entry.name[:-5]  # 移除.json后缀
+            entry = index.get(name)
+            if entry is None or dir_entry.stat().st_mtime_ns > index_mtime:
                 try:
-                    with open(save_file, 'r', encoding='utf-8') as f:
-                        save_data = json.load(f)
-                    saves.append({
-                        "name": filename[:-5],  # 移除.json后缀
-                        "timestamp": save_data.get("timestamp", "未知"),
-                        "scene": save_data["state"]["current_scene"]
-                    })
+                    entry = self._index_entry(read_json(dir_entry.path))
                 except:
-                    pass
+                    continue
+                rebuilt[name] = entry
+            saves.append({
+                "name": name,
+                "timestamp": entry.get("timestamp", "未知"),
+                "scene": entry["current_scene"]
+            })
+
+        if rebuilt:
+            index.update(rebuilt)
+            write_json(os.path.join(self.save_dir, ENGINE_INDEX_FILE), index)
 
         return sorted(saves, key=lambda x: x["timestamp"], reverse=True)
 
+    def _read_save_index(self) -> Dict[str, Dict]:
+        """读取存档索引，索引缺失或损坏时返回空字典"""
+        try:
+            index = read_json(os.path.join(self.save_dir, ENGINE_INDEX_FILE))
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    @staticmethod
+    def _index_entry(save_data: Dict) -> Dict[str, Any]:
+        """由存档数据生成索引条目（格式与 SaveManager 的元数据一致）"""
+        state = save_data["state"]
+        entry = {key: save_data[key] for key in ("timestamp", "version") if key in save_data}
+        entry.update({
+            "current_scene": state["current_scene"],
+            "hp": state.get("hp", 100),
+            "morality": state.get("morality", 50),
+            "knowledge": state.get("knowledge", 0),
+            "achievements_count": len(state.get("achievements", []))
+        })
+        return entry
+
     def render_scene(self) -> Dict[str, Any]:
         """
         渲染当前场景
@@ -328,7 +703,7 @@ class GameEngine:
                 "morality": self.state.morality,
                 "size": self.state.size,
                 "knowledge": self.state.knowledge,
-                "inventory": self.state.inventory,
+                "inventory": list(self.state.inventory),
                 "achievements": self.state.achievements
             },
             "image_prompt": scene.image_prompt,
@@ -343,21 +718,24 @@ class GameEngine:
         Returns:
             结局信息
         """
-        endings = self.script.get("endings", [])
-
         # 检查特殊结局条件
-        for ending in endings:
-            if ending.get("requirements"):
-                if self._check_requirements(ending["requirements"]):
+        passed = self._check_compiled(self._compiled_endings)
+        if passed is not None:
+            for ending, ok in zip(self._conditional_endings, passed):
+                if ok:
+                    return ending
+        else:
+            for ending, check in zip(self._conditional_endings, self._ending_checks):
+                if check(self.state):
                     return ending
 
         # 默认根据道德值和大小值判断结局
         if self.state.morality >= 70:
-            return endings[0] if len(endings) > 0 else {"title": "完美结局", "description": "你成长为了一个善良、勇敢的人"}
+            return self._default_endings[0]
         elif self.state.morality >= 40:
-            return endings[1] if len(endings) > 1 else {"title": "普通结局", "description": "你学到了很多，但还有进步空间"}
+            return self._default_endings[1]
         else:
-            return endings[2] if len(endings) > 2 else {"title": "需要改进", "description": "你还需要学会关心他人"}
+            return self._default_endings[2]
 
 
 def load_script_from_file(script_path: str) -> Dict:
@@ -0,0 +1,200 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import game_engine
+from game_engine import GameEngine, GameState
+
+
+def make_script(requirements_list):
+    """生成只有一个场景的剧本，每组条件对应一个选项（选项文本为序号）"""
+    return {
+        "scenes": [{
+            "id": "start",
+            "title": "开始",
+            "description": "",
+            "choices": [
+                {"text": str(i), "next_scene": "start", "requirements": requirements}
+                for i, requirements in enumerate(requirements_list)
+            ]
+        }]
+    }
+
+
+def available(engine):
+    """当前可用选项的序号集合"""
+    engine.invalidate_choices()
+    return {int(choice.text) for choice in engine.get_available_choices()}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestFlags(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = GameEngine(make_script([
+            {"flag": ["door", True]},
+            {"flag": ["door", False]},
+            {"flag": ["door", None]},
+        ]), save_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_absent_flag(self):
+        """从未设置的标志：只满足 None 条件，不满足 False 条件"""
+        self.assertIsNone(self.engine.get_flag("door"))
+        self.assertEqual(available(self.engine), {2})
+
+    def test_flag_true(self):
+        """标志为 True 时只满足 True 条件"""
+        self.engine.set_flag("door", True)
+        self.assertIs(self.engine.get_flag("door"), True)
+        self.assertEqual(available(self.engine), {0})
+
+    def test_flag_false(self):
+        """显式设置为 False 的标志满足 False 条件"""
+        self.engine.set_flag("door", False)
+        self.assertIs(self.engine.get_flag("door"), False)
+        self.assertEqual(available(self.engine), {1})
+
+    def test_false_flag_survives_save(self):
+        """值为 False 的标志保存后仍然是已设置状态"""
+        self.engine.set_flag("door", False)
+        self.engine.save_game("slot")
+        self.engine.set_flag("door", True)
+
+        self.assertTrue(self.engine.load_game("slot"))
+        self.assertIs(self.engine.get_flag("door"), False)
+        self.assertEqual(available(self.engine), {1})
+
+    def test_non_bool_values_are_coerced(self):
+        """非布尔的标志值按真假保存（与原先按值比较的行为不同，见 SKILL.md）"""
+        self.engine.set_flag("door", "open")
+        self.assertIs(self.engine.get_flag("door"), True)
+        self.assertEqual(available(self.engine), {0})
+        self.engine.set_flag("door", 0)
+        self.assertEqual(available(self.engine), {1})
+
+
+def reference_check(state, requirements):
+    """原先逐项判断的条件检查（state 为普通字典）"""
+    if not requirements:
+        return True
+    if "has_item" in requirements and requirements["has_item"] not in state["inventory"]:
+        return False
+    if "flag" in requirements:
+        flag_name, flag_value = requirements["flag"]
+        if state["flags"].get(flag_name) != flag_value:
+            return False
+    if "morality_min" in requirements and state["morality"] < requirements["morality_min"]:
+        return False
+    if "morality_max" in requirements and state["morality"] > requirements["morality_max"]:
+        return False
+    if "size_min" in requirements and state["size"] < requirements["size_min"]:
+        return False
+    if "size_max" in requirements and state["size"] > requirements["size_max"]:
+        return False
+    if "has_achievement" in requirements and requirements["has_achievement"] not in state["achievements"]:
+        return False
+    return True
+
+
+# 覆盖每种条件类型的选项条件
+REQUIREMENTS = [
+    None,
+    {},
+    {"has_item": "羽毛"},
+    {"has_item": "木鞋"},
+    {"flag": ["saved_morten", True]},
+    {"flag": ["saved_morten", False]},
+    {"flag": ["saved_morten", None]},
+    {"flag": ["never_set", False]},
+    {"flag": ["never_set", None]},
+    {"morality_min": 50},
+    {"morality_max": 50},
+    {"size_min": 10},
+    {"size_max": 10},
+    {"has_achievement": "自然观察者"},
+    {"has_achievement": "雁群之友"},
+    {"has_item": "羽毛", "flag": ["saved_morten", True], "morality_min": 40, "size_max": 50},
+    {"has_achievement": "雁群之友", "morality_max": 80, "size_min": 5},
+]
+
+# 检查条件时的游戏状态
+STATES = [
+    {"inventory": [], "flags": {}, "morality": 50, "size": 10, "achievements": []},
+    {"inventory": ["羽毛"], "flags": {"saved_morten": True}, "morality": 60, "size": 5, "achievements": ["自然观察者"]},
+    {"inventory": ["木鞋"], "flags": {"saved_morten": False}, "morality": 49, "size": 11, "achievements": ["雁群之友"]},
+    {"inventory": ["羽毛", "木鞋"], "flags": {"saved_morten": True}, "morality": 0, "size": 100,
+     "achievements": ["雁群之友", "自然观察者"]},
+]
+
+
+class TestRequirementChecks(unittest.TestCase):
+
+    def make_engine(self, script):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return GameEngine(script, save_dir=tmp.name)
+
+    def apply_state(self, engine, state):
+        engine.state = GameState(morality=state["morality"], size=state["size"])
+        for item in state["inventory"]:
+            engine.state.add_item(item)
+        for achievement in state["achievements"]:
+            engine.state.add_achievement(achievement)
+        for flag, value in state["flags"].items():
+            engine.set_flag(flag, value)
+
+    def check_choices(self, batch_min_rows):
+        with mock.patch.object(game_engine, "BATCH_CHECK_MIN_ROWS", batch_min_rows):
+            engine = self.make_engine(make_script(REQUIREMENTS))
+        for i, state in enumerate(STATES):
+            with self.subTest(state=i):
+                self.apply_state(engine, state)
+                expected = {j for j, requirements in enumerate(REQUIREMENTS) if reference_check(state, requirements)}
+                self.assertEqual(available(engine), expected)
+        return engine
+
+    def check_endings(self, batch_min_rows):
+        script = make_script([])
+        script["endings"] = [
+            {"title": str(i), "requirements": requirements}
+            for i, requirements in enumerate(REQUIREMENTS) if requirements
+        ]
+        with mock.patch.object(game_engine, "BATCH_CHECK_MIN_ROWS", batch_min_rows):
+            engine = self.make_engine(script)
+        for i, state in enumerate(STATES):
+            with self.subTest(state=i):
+                self.apply_state(engine, state)
+                expected = next(
+                    ending["title"] for ending in script["endings"] if reference_check(state, ending["requirements"])
+                )
+                self.assertEqual(engine.get_ending()["title"], expected)
+        return engine
+
+    def test_compiled_checks_match_reference(self):
+        """exec 生成的检查函数与原先的逐项检查一致"""
+        engine = self.check_choices(batch_min_rows=10 ** 9)
+        self.assertEqual(engine._compiled_requirements, {})
+
+    def test_compiled_ending_checks_match_reference(self):
+        """结局条件的检查函数与原先的逐项检查一致"""
+        self.check_endings(batch_min_rows=10 ** 9)
+
+    @unittest.skipUnless(game_engine.NUMBA_AVAILABLE, "需要 numba")
+    def test_numba_kernel_matches_reference(self):
+        """numba 批量检查与原先的逐项检查一致"""
+        engine = self.check_choices(batch_min_rows=1)
+        self.assertIn("start", engine._compiled_requirements)
+
+    @unittest.skipUnless(game_engine.NUMBA_AVAILABLE, "需要 numba")
+    def test_numba_ending_kernel_matches_reference(self):
+        """结局条件的 numba 批量检查与原先的逐项检查一致"""
+        engine = self.check_endings(batch_min_rows=1)
+        self.assertIsNotNone(engine._compiled_endings)
+
+
+if __name__ == "__main__":
+    unittest.main()
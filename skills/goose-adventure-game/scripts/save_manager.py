@@ -11,12 +11,77 @@ Save Manager for "The Wonderful Adventures of Nils"
 - 进度统计
 """
 
+import copy
 import json
 import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# 场景ID前缀 -> 章节名称
+CHAPTER_NAMES = {
+    "start": "序幕",
+    "tutorial": "游戏指南",
+    "chapter1": "第一章：变小的人",
+    "chapter2": "第二章：初遇雁群",
+    "chapter3": "第三章：夜晚的营地",
+    "chapter4": "第四章：奥斯莫山区",
+    "chapter5": "第五章：风暴来袭",
+    "chapter6": "第六章：风暴后的平静",
+    "chapter7": "第七章：北方的呼唤",
+    "chapter8": "第八章：凯布讷山的考验"
+}
+
+# 存档元数据索引文件名
+SAVE_INDEX_FILE = "saves_meta.json"
+
+# 流式解析存档时需要提取的摘要字段 {事件前缀: 摘要键}
+_SUMMARY_PREFIXES = {
+    f"game_data.{key}": key for key in ("current_scene", "hp", "morality", "knowledge")
+}
+_SCALAR_EVENTS = ("string", "number", "boolean", "null")
+
+# 一次匹配取出场景ID的章节前缀；由 CHAPTER_NAMES 的键生成，较长的键优先匹配
+_CHAPTER_PATTERN = re.compile("|".join(map(re.escape, sorted(CHAPTER_NAMES, key=len, reverse=True))))
+
+# 标准库回退路径共用的编码器/解码器，输出与 orjson 一致的紧凑格式
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_JSON_DECODER = json.JSONDecoder()
+
+# 最近一次生成的时间戳 (time.time(), ISO 字符串)，整体替换以保证线程安全
+_TS_CACHE = (0.0, "")
+
+
+def _fast_iso_now() -> str:
+    """返回当前时间的 ISO 字符串，0.5 秒内重复调用直接复用上次的结果"""
+    global _TS_CACHE
+    t = time.time()
+    if t - _TS_CACHE[0] > 0.5:
+        _TS_CACHE = (t, datetime.fromtimestamp(t).isoformat())
+    return _TS_CACHE[1]
+
 
 class SaveManager:
     """游戏存档管理器"""
@@ -30,7 +95,9 @@ class SaveManager:
         """
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
-        self.meta_file = self.save_dir / "saves_meta.json"
+        self.meta_file = self.save_dir / SAVE_INDEX_FILE
+        # 自动保存在后台线程写入，存档与元数据的读改写需互斥
+        self._lock = threading.RLock()
 
     def save_game(self, slot_name: str, game_data: Dict) -> str:
         """
@@ -47,18 +114,18 @@ class SaveManager:
 
         save_data = {
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _fast_iso_now(),
                 "version": "1.0",
                 "slot_name": slot_name
             },
             "game_data": game_data
         }
 
-        with open(save_file, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        with self._lock:
+            write_json(save_file, save_data)
 
-        # 更新元数据
-        self._update_metadata(slot_name, save_data["metadata"])
+            # 更新元数据索引（附带存档摘要）
+            self._update_metadata(slot_name, {**save_data["metadata"], **summarize_game_data(game_data)})
 
         return str(save_file)
 
@@ -77,8 +144,7 @@ class SaveManager:
         if not save_file.exists():
             return None
 
-        with open(save_file, 'r', encoding='utf-8') as f:
-            save_data = json.load(f)
+        save_data = read_json(save_file)
 
         return save_data.get("game_data")
 
@@ -94,46 +160,69 @@ class SaveManager:
         """
         save_file = self.save_dir / f"{slot_name}.json"
 
-        if save_file.exists():
-            save_file.unlink()
-            self._remove_metadata(slot_name)
-            return True
+        with self._lock:
+            if save_file.exists():
+                save_file.unlink()
+                self._remove_metadata(slot_name)
+                return True
 
         return False
 
-    def list_saves(self) -> List[Dict[str, Any]]:
+    def list_saves(self, verbose: bool = False) -> List[Dict[str, Any]]:
         """
         列出所有存档
 
+        摘要信息直接取自元数据索引，只有索引中缺失、或存档文件比索引新
+        （例如由 GameEngine 直接写入）的存档才读取存档文件，读取结果随即补写回索引
+
+        Args:
+            verbose: 读取存档文件时完整解析 JSON（默认安装了 ijson 时流式提取摘要字段）
+
         Returns:
             存档信息列表
         """
         saves = []
-
-        for save_file in self.save_dir.glob("*.json"):
-            if save_file.name == "saves_meta.json":
-                continue
-
-            try:
-                with open(save_file, 'r', encoding='utf-8') as f:
-                    save_data = json.load(f)
-
-                metadata = save_data.get("metadata", {})
-                game_data = save_data.get("game_data", {})
-
-                saves.append({
-                    "name": save_file.stem,
-                    "timestamp": metadata.get("timestamp", "未知"),
-                    "version": metadata.get("version", "未知"),
-                    "current_scene": game_data.get("current_scene", "未知"),
-                    "chapter": self._get_chapter_name(game_data.get("current_scene", "")),
-                    "hp": game_data.get("hp", 100),
-                    "morality": game_data.get("morality", 50),
-                    "knowledge": game_data.get("knowledge", 0),
-                    "achievements_count": len(game_data.get("achievements", []))
-                })
-            except Exception as e:
-                print(f"读取存档失败 {save_file}: {e}")
+        # 先取索引的修改时间再读索引，期间写入的存档按过期处理
+        try:
+            meta_mtime = self.meta_file.stat().st_mtime_ns
+        except OSError:
+            meta_mtime = 0
+        meta = self._read_metadata()
+        rebuilt = {}
+
+        # scandir 的目录项自带文件类型，按文件名过滤时不需要额外的 stat
+        with os.scandir(self.save_dir) as it:
+            entries = [
+                entry for entry in it
+                if entry.name.endswith(".json") and entry.name != SAVE_INDEX_FILE and entry.is_file()
+            ]
+
+        for dir_entry in entries:
+            slot_name = dir_entry.name[:-5]  # 移除.json后缀
+            entry = meta.get(slot_name)
+            if entry is None or "achievements_count" not in entry or dir_entry.stat().st_mtime_ns > meta_mtime:
+                try:
+                    entry = self._read_summary(dir_entry.path, verbose)
+                except Exception as e:
+                    print(f"读取存档失败 {dir_entry.path}: {e}")
+                    continue
+                rebuilt[slot_name] = entry
+
+            saves.append({
+                "name": slot_name,
+                "timestamp": entry.get("timestamp", "未知"),
+                "version": entry.get("version", "未知"),
+                "current_scene": entry.get("current_scene", "未知"),
+                "chapter": self._get_chapter_name(entry.get("current_scene", "")),
+                "hp": entry.get("hp", 100),
+                "morality": entry.get("morality", 50),
+                "knowledge": entry.get("knowledge", 0),
+                "achievements_count": entry.get("achievements_count", 0)
+            })
+
+        if rebuilt:
+            with self._lock:
+                self._merge_metadata(rebuilt)
 
         return sorted(saves, key=lambda x: x["timestamp"], reverse=True)
 
@@ -171,17 +260,24 @@ class SaveManager:
         if not os.path.exists(import_path):
             return False
 
-        import shutil
-        target_path = self.save_dir / f"{slot_name}.json"
-        shutil.copy2(import_path, target_path)
-
-        # 更新元数据
+        # 只读取、解析一次：校验通过后原样写入目标存档，无效文件不会被复制
+        data_bytes = Path(import_path).read_bytes()
         try:
-            with open(target_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            self._update_metadata(slot_name, save_data.get("metadata", {}))
-        except:
-            pass
+            save_data = loads_json(data_bytes)
+        except ValueError:
+            return False
+        if not isinstance(save_data, dict):
+            return False
+        metadata = save_data.get("metadata")
+        game_data = save_data.get("game_data", {})
+        if not isinstance(metadata, dict) or not isinstance(game_data, dict):
+            return False
+
+        target_path = self.save_dir / f"{slot_name}.json"
+        summary = summarize_game_data(game_data)
+        with self._lock:
+            write_bytes(target_path, data_bytes)
+            self._update_metadata(slot_name, {**metadata, **summary})
 
         return True
 
@@ -217,55 +313,78 @@ class SaveManager:
 
     def _update_metadata(self, slot_name: str, metadata: Dict):
         """更新存档元数据"""
-        meta = {}
+        self._merge_metadata({slot_name: metadata})
+
+    def _merge_metadata(self, entries: Dict[str, Dict]):
+        """批量写入存档元数据"""
+        meta = self._read_metadata()
+        meta.update(entries)
 
-        if self.meta_file.exists():
-            with open(self.meta_file, 'r', encoding='utf-8') as f:
-                meta = json.load(f)
+        write_json(self.meta_file, meta)
 
-        meta[slot_name] = metadata
+    def _read_metadata(self) -> Dict[str, Dict]:
+        """读取元数据索引，索引缺失或损坏时返回空字典"""
+        try:
+            meta = read_json(self.meta_file)
+        except (OSError, ValueError):
+            return {}
+        return meta if isinstance(meta, dict) else {}
 
-        with open(self.meta_file, 'w', encoding='utf-8') as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+    def _read_summary(self, save_file: str, verbose: bool = False) -> Dict[str, Any]:
+        """
+        读取存档文件，返回与元数据索引相同格式的摘要
+
+        安装了 ijson 时按事件流式解析，只取摘要字段、统计成就个数，
+        不为 history、flags 等字段构造 Python 对象
+        """
+        if verbose or not IJSON_AVAILABLE:
+            save_data = read_json(save_file)
+            return {**save_data.get("metadata", {}), **summarize_game_data(save_data.get("game_data", {}))}
+
+        summary = {}
+        achievements_count = 0
+        with open(save_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == "game_data.achievements.item":
+                    if event not in ("end_map", "end_array", "map_key"):
+                        achievements_count += 1
+                elif event in _SCALAR_EVENTS:
+                    key = _SUMMARY_PREFIXES.get(prefix)
+                    if key is None and prefix.startswith("metadata.") and prefix.count(".") == 1:
+                        key = prefix[len("metadata."):]
+                    if key is not None:
+                        summary[key] = value
+
+        summary["achievements_count"] = achievements_count
+        return summary
 
     def _remove_metadata(self, slot_name: str):
         """移除存档元数据"""
         if not self.meta_file.exists():
             return
 
-        with open(self.meta_file, 'r', encoding='utf-8') as f:
-            meta = json.load(f)
+        meta = read_json(self.meta_file)
 
         if slot_name in meta:
             del meta[slot_name]
 
-        with open(self.meta_file, 'w', encoding='utf-8') as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        write_json(self.meta_file, meta)
 
     def _get_chapter_name(self, scene_id: str) -> str:
         """根据场景ID获取章节名称"""
-        chapter_map = {
-            "start": "序幕",
-            "tutorial": "游戏指南",
-            "chapter1": "第一章：变小的人",
-            "chapter2": "第二章：初遇雁群",
-            "chapter3": "第三章：夜晚的营地",
-            "chapter4": "第四章：奥斯莫山区",
-            "chapter5": "第五章：风暴来袭",
-            "chapter6": "第六章：风暴后的平静",
-            "chapter7": "第七章：北方的呼唤",
-            "chapter8": "第八章：凯布讷山的考验"
-        }
-
-        for key, value in chapter_map.items():
-            if scene_id.startswith(key):
-                return value
-
-        return "未知章节"
+        match = _CHAPTER_PATTERN.match(scene_id)
+        if match is None:
+            return "未知章节"
+        return CHAPTER_NAMES.get(match.group(0), "未知章节")
 
 
 class AutoSaveManager:
-    """自动保存管理器"""
+    """
+    自动保存管理器
+
+    存档在后台线程中写入，不阻塞游戏循环；同一存档槽尚未开始写入的旧快照
+    会被新快照取代。退出前调用 flush() 等待写入完成
+    """
 
     def __init__(self, save_manager: SaveManager, auto_save_interval: int = 5):
         """
@@ -278,6 +397,11 @@ class AutoSaveManager:
         self.save_manager = save_manager
         self.auto_save_interval = auto_save_interval
         self.scene_count = 0
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_future: Optional[Future] = None
+        self._pending_slot: Optional[str] = None
+        # 最近一次成功写入的 (存档槽, 内容哈希)，内容未变时跳过自动保存
+        self._last_saved_hash: Optional[tuple] = None
 
     def on_scene_change(self, slot_name: str, game_data: Dict):
         """
@@ -290,20 +414,93 @@ class AutoSaveManager:
         self.scene_count += 1
 
         if self.scene_count >= self.auto_save_interval:
-            self.save_manager.save_game(slot_name, game_data)
             self.scene_count = 0
+            data_hash = content_hash(game_data)
+            if (slot_name, data_hash) == self._last_saved_hash:
+                return
+            self._submit(slot_name, game_data, data_hash)
 
     def force_save(self, slot_name: str, game_data: Dict):
         """
-        强制保存
+        强制保存（等待写入完成，不检查内容是否变化）
 
         Args:
             slot_name: 存档槽名称
             game_data: 游戏数据
         """
-        self.save_manager.save_game(slot_name, game_data)
+        self._submit(slot_name, game_data, content_hash(game_data)).result()
         self.scene_count = 0
 
+    def flush(self):
+        """等待所有已提交的存档写入完成"""
+        if self._pending_future is not None:
+            self._pending_future.result()
+
+    def _submit(self, slot_name: str, game_data: Dict, data_hash: int) -> Future:
+        """复制一份游戏数据快照并提交到后台线程写入（data_hash 为调用方已算好的内容哈希）"""
+        snapshot = copy.deepcopy(game_data)
+
+        # 同一存档槽还在排队的旧快照无需再写
+        if self._pending_future is not None and self._pending_slot == slot_name:
+            self._pending_future.cancel()
+
+        future = self._executor.submit(self.save_manager.save_game, slot_name, snapshot)
+        future.add_done_callback(lambda f: self._on_saved(f, (slot_name, data_hash)))
+        self._pending_future = future
+        self._pending_slot = slot_name
+        return future
+
+    def _on_saved(self, future: Future, saved_hash: tuple):
+        """写入成功后才记录内容哈希；写入失败或被取消时，之后相同的内容仍会重新保存"""
+        if not future.cancelled() and future.exception() is None:
+            self._last_saved_hash = saved_hash
+
+
+def summarize_game_data(game_data: Dict) -> Dict[str, Any]:
+    """提取存档列表展示所需的摘要字段"""
+    summary = {key: game_data[key] for key in ("current_scene", "hp", "morality", "knowledge") if key in game_data}
+    summary["achievements_count"] = len(game_data.get("achievements", []))
+    return summary
+
+
+def content_hash(game_data: Dict) -> int:
+    """计算游戏数据的内容哈希（xxhash 与 orjson 可用时哈希紧凑字节，否则哈希标准库 JSON 文本）"""
+    if XXHASH_AVAILABLE and ORJSON_AVAILABLE:
+        return xxhash.xxh64_intdigest(orjson.dumps(game_data, option=orjson.OPT_NON_STR_KEYS))
+    return hash(_JSON_ENCODER.encode(game_data))
+
+
+def write_json(path: Path, data: Any):
+    """
+    写入紧凑格式的 JSON 文件（orjson 可用时直接输出 UTF-8 字节，否则使用共用的标准库编码器）
+
+    先写入同目录下的临时文件再替换目标文件，写入中断时不会留下损坏的存档
+    """
+    if ORJSON_AVAILABLE:
+        write_bytes(path, orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        write_bytes(path, _JSON_ENCODER.encode(data).encode('utf-8'))
+
+
+def write_bytes(path: Path, data: bytes):
+    """先写入同目录下的临时文件再替换目标文件"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def read_json(path: Path) -> Any:
+    """读取 JSON 文件（orjson 可用时直接解析字节，否则使用标准库）"""
+    return loads_json(Path(path).read_bytes())
+
+
+def loads_json(data: bytes) -> Any:
+    """解析 JSON 字节（orjson 可用时直接解析，否则按 UTF-8 解码后使用共用的标准库解码器）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return _JSON_DECODER.decode(data.decode('utf-8'))
+
 
 def format_playtime(timestamp: str) -> str:
     """格式化游戏时间"""
@@ -11,14 +11,22 @@ Version: 2.0
 License: MIT
 """
 
+import gzip
 import json
 import os
-from typing import Dict, List, Any, Optional, Callable
-from dataclasses import dataclass, asdict, field
+import sys
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class NarratorStyle(Enum):
     """Narrator style presets"""
@@ -46,7 +54,128 @@ class MusicMood(Enum):
     STORM = "storm"
 
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Saves are gzip-compressed JSON; plain .json saves from older versions still load
+SAVE_SUFFIX = ".json.gz"
+LEGACY_SAVE_SUFFIX = ".json"
+SAVE_COMPRESSLEVEL = 1  # Fastest level; still shrinks the repetitive JSON several times
+
+# Save file suffixes in lookup order (a slot normally has only one of them)
+SAVE_SUFFIXES = (SAVE_SUFFIX, LEGACY_SAVE_SUFFIX)
+
+# Suffix of the small per-slot summary file written next to each save
+SAVE_META_SUFFIX = ".meta.json"
+
+# Requirement keys in evaluation order, with the code for a failed check.
+# Placeholders {0}/{1} are the requirement value (two-element values are unpacked).
+_REQUIREMENT_CHECKS = (
+    ("has_item", "{0} not in s.inventory", 1),
+    ("has_any_item", "not any(item in s.inventory for item in {0})", 1),
+    ("has_all_items", "not all(item in s.inventory for item in {0})", 1),
+    ("flag", "s.flags.get({0}) != {1}", 2),
+    ("flag_set", "{0} not in s.flags", 1),
+    ("flag_not_set", "{0} in s.flags", 1),
+) + tuple(
+    (f"{stat}_{bound}", f"s.{stat} {op} {{0}}", 1)
+    for stat in ("morality", "size", "hp", "knowledge", "gold")
+    for bound, op in (("min", "<"), ("max", ">"))
+) + (
+    ("stat_min", "s.stats.get({0}, 0) < {1}", 2),
+    ("has_achievement", "{0} not in s.achievements", 1),
+    ("visited_scene", "{0} not in s.visited", 1),
+)
+
+# Predicate factories generated per requirement shape (tuple of keys present)
+_PREDICATE_FACTORIES: Dict[tuple, Callable] = {}
+
+
+def _always_true(state: 'GameState') -> bool:
+    """Predicate for choices without requirements."""
+    return True
+
+
+def _compile_requirements(requirements: Optional[Dict]) -> Callable[['GameState'], bool]:
+    """
+    Compile a requirements dict into a predicate on the game state.
+
+    One function body is generated with exec for each distinct set of
+    requirement keys; the requirement values are bound as closure variables,
+    so checking a choice is a single call with no dict probing.
+
+    Args:
+        requirements: Requirements dict from the game script
+
+    Returns:
+        Callable taking a GameState and returning whether requirements are met
+    """
+    if not requirements:
+        return _always_true
+
+    checks = [(key, template, arity) for key, template, arity in _REQUIREMENT_CHECKS if key in requirements]
+    shape = tuple(key for key, _, _ in checks)
+    factory = _PREDICATE_FACTORIES.get(shape)
+    if factory is None:
+        params = []
+        lines = []
+        for key, template, arity in checks:
+            names = [f"v{len(params) + i}" for i in range(arity)]
+            params.extend(names)
+            lines.append(f"        if {template.format(*names)}: return False")
+        source = "\n".join([
+            f"def make({', '.join(params)}):",
+            "    def check(s):",
+            *lines,
+            "        return True",
+            "    return check",
+        ])
+        namespace: Dict[str, Any] = {}
+        exec(source, namespace)
+        factory = _PREDICATE_FACTORIES[shape] = namespace["make"]
+
+    args = []
+    for key, _, arity in checks:
+        value = requirements[key]
+        if key in ("flag_set", "flag_not_set"):
+            value = _intern(value)
+        elif key == "flag":
+            value = (_intern(value[0]), value[1])
+        if arity == 1:
+            args.append(value)
+        else:
+            args.extend(value)
+    return factory(*args)
+
+
+def _intern(name: Any) -> Any:
+    """Intern string names so flag dict lookups hit the identity fast path."""
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def _clamp100(value):
+    """Clamp a stat to 0-100 without the min()/max() calls."""
+    return 0 if value < 0 else 100 if value > 100 else value
+
+
+def _clamp0(value):
+    """Clamp a stat at 0 from below."""
+    return 0 if value < 0 else value
+
+
+def _intern_effects(effects: Optional[Dict]) -> Optional[Dict]:
+    """Return effects with interned flag names (the script data is left untouched)."""
+    if not effects or ("set_flag" not in effects and "clear_flag" not in effects):
+        return effects
+    effects = dict(effects)
+    if "set_flag" in effects:
+        effects["set_flag"] = {_intern(flag): value for flag, value in effects["set_flag"].items()}
+    if "clear_flag" in effects:
+        effects["clear_flag"] = _intern(effects["clear_flag"])
+    return effects
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class GameState:
     """Represents the current state of the game."""
     current_scene: str = "start"
@@ -55,23 +184,46 @@ class GameState:
     size: int = 100  # 0 = tiny, 100 = normal
     knowledge: int = 0
     gold: int = 0
-    inventory: List[str] = field(default_factory=list)
-    achievements: List[str] = field(default_factory=list)
+    inventory: Dict[str, bool] = field(default_factory=dict)  # Ordered set of items
+    achievements: Dict[str, bool] = field(default_factory=dict)  # Ordered set of achievements
     flags: Dict[str, Any] = field(default_factory=dict)
     history: List[str] = field(default_factory=list)
     stats: Dict[str, int] = field(default_factory=dict)  # Custom stat counters
+    visited: Dict[str, bool] = field(default_factory=dict)  # Ordered set of scenes left via a choice
+
+    def __post_init__(self):
+        # Saves store inventory/achievements as lists; keep them as insertion-ordered dicts
+        self.inventory = dict.fromkeys(self.inventory, True)
+        self.achievements = dict.fromkeys(self.achievements, True)
+        # Older saves have no visited list; rebuild it from the "scene:choice" history
+        self.visited = dict.fromkeys(self.visited or (entry.partition(":")[0] for entry in self.history), True)
+        self.flags = {_intern(flag): value for flag, value in self.flags.items()}
 
     def to_dict(self) -> Dict:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+        """Convert to dictionary for serialization (containers are shallow-copied)."""
+        return {
+            "current_scene": self.current_scene,
+            "hp": self.hp,
+            "morality": self.morality,
+            "size": self.size,
+            "knowledge": self.knowledge,
+            "gold": self.gold,
+            "inventory": list(self.inventory),
+            "achievements": list(self.achievements),
+            "flags": dict(self.flags),
+            "history": list(self.history),
+            "stats": dict(self.stats),
+            "visited": list(self.visited)
+        }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'GameState':
-        """Create from dictionary."""
-        return cls(**data)
+        """Create from dictionary, ignoring keys that are not GameState fields."""
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in fields})
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Choice:
     """Represents a player choice in a scene."""
     text: str
@@ -82,9 +234,12 @@ class Choice:
     knowledge_gain: Optional[int] = None
     gold_change: Optional[int] = None
     hp_change: Optional[int] = None
+    _predicate: Callable[[GameState], bool] = field(default=_always_true, repr=False, compare=False)
+    # on_enter effects of next_scene, resolved once all scenes are loaded
+    _enter_effects: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Scene:
     """Represents a scene in the game."""
     id: str
@@ -131,6 +286,9 @@ class TextAdventureEngine:
             "on_load": []
         }
         self.debug = debug
+        self._state_version = 0  # Bumped whenever the engine changes the state
+        self._choices_cache: Optional[tuple] = None  # (scene id, available choices)
+        self._render_cache: Optional[tuple] = None  # ((scene id, state version), rendered scene)
         self._load_scenes()
         self._load_config()
 
@@ -138,6 +296,21 @@ class TextAdventureEngine:
         """Load game configuration."""
         self.config = self.script.get("config", {})
         self.game_info = self.script.get("game_info", {})
+        # game_info never changes, so its encoded save-file prefix is built once
+        self._save_prefix = (
+            b'{"game_info":' + orjson.dumps(self.game_info, option=orjson.OPT_NON_STR_KEYS) + b',"state":'
+            if ORJSON_AVAILABLE else None
+        )
+        # Knowledge milestones as (threshold, achievement), ascending by threshold
+        self._knowledge_milestones: List[Tuple[int, str]] = sorted(
+            ((int(threshold), achievement)
+             for threshold, achievement in self.config.get("knowledge_milestones", {}).items()),
+            key=lambda milestone: milestone[0]
+        )
+        self._ending_predicates = [
+            (ending, _compile_requirements(ending["requirements"]))
+            for ending in self.script.get("endings", []) if ending.get("requirements")
+        ]
 
     def _load_scenes(self):
         """Load all scenes from script data."""
@@ -148,11 +321,12 @@ class TextAdventureEngine:
                     text=choice_data["text"],
                     next_scene=choice_data["next_scene"],
                     requirements=choice_data.get("requirements"),
-                    effects=choice_data.get("effects"),
+                    effects=_intern_effects(choice_data.get("effects")),
                     morality_change=choice_data.get("morality_change"),
                     knowledge_gain=choice_data.get("knowledge_gain"),
                     gold_change=choice_data.get("gold_change"),
-                    hp_change=choice_data.get("hp_change")
+                    hp_change=choice_data.get("hp_change"),
+                    _predicate=_compile_requirements(choice_data.get("requirements"))
                 ))
             self.scenes[scene_data["id"]] = Scene(
                 id=scene_data["id"],
@@ -162,93 +336,71 @@ class TextAdventureEngine:
                 image_prompt=scene_data.get("image_prompt"),
                 music=scene_data.get("music"),
                 narrator=scene_data.get("narrator"),
-                on_enter=scene_data.get("on_enter")
+                on_enter=_intern_effects(scene_data.get("on_enter"))
             )
 
+        # Resolve each choice's target on_enter now, so make_choice needs no scene lookup
+        for scene in self.scenes.values():
+            for choice in scene.choices:
+                target = self.scenes.get(choice.next_scene)
+                choice._enter_effects = target.on_enter if target else None
+
     def register_hook(self, event: str, callback: Callable):
         """Register a callback for a specific event."""
         if event in self.hooks:
             self.hooks[event].append(callback)
 
     def _trigger_hooks(self, event: str, *args, **kwargs):
-        """Trigger all callbacks for an event."""
-        for hook in self.hooks.get(event, []):
+        """
+        Trigger all callbacks for an event.
+
+        Hooks may change self.state, so the cached choices and rendered scene
+        are invalidated after any callback has run.
+        """
+        hooks = self.hooks.get(event)
+        if not hooks:
+            return
+        for hook in hooks:
             hook(*args, **kwargs)
+        self.invalidate_choices()
 
     def get_current_scene(self) -> Optional[Scene]:
         """Get the current scene object."""
         return self.scenes.get(self.state.current_scene)
 
     def get_available_choices(self) -> List[Choice]:
-        """Get all choices that meet their requirements."""
+        """
+        Get all choices that meet their requirements.
+
+        The result is cached until the state changes through the engine
+        (make_choice, jump_to_scene, set_state, load_game, or any hook
+        callback). Call invalidate_choices() after mutating self.state directly.
+        """
+        cache = self._choices_cache
+        if cache is not None and cache[0] == self.state.current_scene:
+            return cache[1]
+
         scene = self.get_current_scene()
         if not scene:
             return []
 
-        available = []
-        for choice in scene.choices:
-            if self._check_requirements(choice.requirements):
-                available.append(choice)
+        state = self.state
+        available = [choice for choice in scene.choices if choice._predicate(state)]
+        self._choices_cache = (self.state.current_scene, available)
         return available
 
-    def _check_requirements(self, requirements: Optional[Dict]) -> bool:
-        """Check if requirements are met."""
-        if not requirements:
-            return True
-
-        # Item checks
-        if "has_item" in requirements:
-            if requirements["has_item"] not in self.state.inventory:
-                return False
-
-        if "has_any_item" in requirements:
-            if not any(item in self.state.inventory for item in requirements["has_any_item"]):
-                return False
-
-        if "has_all_items" in requirements:
-            if not all(item in self.state.inventory for item in requirements["has_all_items"]):
-                return False
-
-        # Flag checks
-        if "flag" in requirements:
-            flag_name, flag_value = requirements["flag"]
-            if self.state.flags.get(flag_name) != flag_value:
-                return False
-
-        if "flag_set" in requirements:
-            if requirements["flag_set"] not in self.state.flags:
-                return False
-
-        if "flag_not_set" in requirements:
-            if requirements["flag_not_set"] in self.state.flags:
-                return False
-
-        # Stat range checks
-        for stat in ["morality", "size", "hp", "knowledge", "gold"]:
-            if f"{stat}_min" in requirements:
-                if getattr(self.state, stat) < requirements[f"{stat}_min"]:
-                    return False
-            if f"{stat}_max" in requirements:
-                if getattr(self.state, stat) > requirements[f"{stat}_max"]:
-                    return False
-
-        # Custom stat checks
-        if "stat_min" in requirements:
-            stat_name, min_value = requirements["stat_min"]
-            if self.state.stats.get(stat_name, 0) < min_value:
-                return False
-
-        # Achievement checks
-        if "has_achievement" in requirements:
-            if requirements["has_achievement"] not in self.state.achievements:
-                return False
-
-        # Scene history checks
-        if "visited_scene" in requirements:
-            if not any(req in h for h in self.state.history):
-                return False
+    def num_available_choices(self) -> int:
+        """Get the number of choices that meet their requirements."""
+        return len(self.get_available_choices())
 
-        return True
+    def invalidate_choices(self):
+        """Drop the cached available choices and rendered scene after a state change."""
+        self._state_version += 1
+        self._choices_cache = None
+
+    def _check_requirements(self, requirements: Optional[Dict]) -> bool:
+        """Check if requirements are met (compiling them on the fly)."""
+        return _compile_requirements(requirements)(self.state)
 
     def make_choice(self, choice_index: int) -> bool:
         """
@@ -268,6 +420,7 @@ class TextAdventureEngine:
 
         # Record history
         self.state.history.append(f"{self.state.current_scene}:{choice.text}")
+        self.state.visited[self.state.current_scene] = True
 
         # Trigger exit hooks
         self._trigger_hooks("on_scene_exit", self.state.current_scene)
@@ -278,17 +431,17 @@ class TextAdventureEngine:
 
         # Apply direct stat changes
         if choice.morality_change is not None:
-            self.state.morality = max(0, min(100, self.state.morality + choice.morality_change))
+            self.state.morality = _clamp100(self.state.morality + choice.morality_change)
 
         if choice.knowledge_gain is not None:
             self.state.knowledge += choice.knowledge_gain
             self._check_knowledge_achievements()
 
         if choice.gold_change is not None:
-            self.state.gold = max(0, self.state.gold + choice.gold_change)
+            self.state.gold = _clamp0(self.state.gold + choice.gold_change)
 
         if choice.hp_change is not None:
-            self.state.hp = max(0, min(100, self.state.hp + choice.hp_change))
+            self.state.hp = _clamp100(self.state.hp + choice.hp_change)
 
         # Trigger choice hooks
         self._trigger_hooks("on_choice", choice)
@@ -298,9 +451,9 @@ class TextAdventureEngine:
         self.state.current_scene = choice.next_scene
 
         # Apply on_enter effects
-        scene = self.get_current_scene()
-        if scene and scene.on_enter:
-            self._apply_effects(scene.on_enter)
+        if choice._enter_effects:
+            self._apply_effects(choice._enter_effects)
+        self.invalidate_choices()
 
         # Trigger enter hooks
         self._trigger_hooks("on_scene_enter", prev_scene, self.state.current_scene)
@@ -309,34 +462,33 @@ class TextAdventureEngine:
 
     def _apply_effects(self, effects: Dict):
         """Apply effects to game state."""
+        if not effects:
+            return
+        clamp100 = _clamp100
+
         # Item management
         if "add_item" in effects:
-            item = effects["add_item"]
-            if item not in self.state.inventory:
-                self.state.inventory.append(item)
+            self.state.inventory[effects["add_item"]] = True
 
         if "add_items" in effects:
             for item in effects["add_items"]:
-                if item not in self.state.inventory:
-                    self.state.inventory.append(item)
+                self.state.inventory[item] = True
 
         if "remove_item" in effects:
-            item = effects["remove_item"]
-            if item in self.state.inventory:
-                self.state.inventory.remove(item)
+            self.state.inventory.pop(effects["remove_item"], None)
 
         # Stat changes
         if "hp_change" in effects:
-            self.state.hp = max(0, min(100, self.state.hp + effects["hp_change"]))
+            self.state.hp = clamp100(self.state.hp + effects["hp_change"])
 
         if "morality_change" in effects:
-            self.state.morality = max(0, min(100, self.state.morality + effects["morality_change"]))
+            self.state.morality = clamp100(self.state.morality + effects["morality_change"])
 
         if "size_change" in effects:
-            self.state.size = max(0, min(100, self.state.size + effects["size_change"]))
+            self.state.size = clamp100(self.state.size + effects["size_change"])
 
         if "gold_change" in effects:
-            self.state.gold = max(0, self.state.gold + effects["gold_change"])
+            self.state.gold = _clamp0(self.state.gold + effects["gold_change"])
 
         if "knowledge_gain" in effects:
             self.state.knowledge += effects["knowledge_gain"]
@@ -359,9 +511,7 @@ class TextAdventureEngine:
 
         # Achievement management
         if "add_achievement" in effects:
-            achievement = effects["add_achievement"]
-            if achievement not in self.state.achievements:
-                self.state.achievements.append(achievement)
+            self.state.achievements[effects["add_achievement"]] = True
 
         # Special effects
         if "game_over" in effects:
@@ -372,10 +522,13 @@ class TextAdventureEngine:
 
     def _check_knowledge_achievements(self):
         """Check and award knowledge-based achievements."""
-        milestones = self.config.get("knowledge_milestones", {})
-        for threshold, achievement in milestones.items():
-            if self.state.knowledge >= int(threshold) and achievement not in self.state.achievements:
-                self.state.achievements.append(achievement)
+        knowledge = self.state.knowledge
+        achievements = self.state.achievements
+        for threshold, achievement in self._knowledge_milestones:
+            if threshold > knowledge:
+                break
+            if achievement not in achievements:
+                achievements[achievement] = True
 
     def save_game(self, slot_name: str = "autosave") -> str:
         """
@@ -389,17 +542,37 @@ class TextAdventureEngine:
         """
         self._trigger_hooks("on_save", slot_name)
 
-        save_file = self.save_dir / f"{slot_name}.json"
-
-        save_data = {
-            "game_info": self.game_info,
-            "state": self.state.to_dict(),
-            "timestamp": datetime.now().isoformat(),
-            "version": self.game_info.get("version", "2.0")
-        }
-
-        with open(save_file, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        save_file = self.save_dir / f"{slot_name}{SAVE_SUFFIX}"
+        state = self.state.to_dict()
+        timestamp = datetime.now().isoformat()
+        version = self.game_info.get("version", "2.0")
+
+        if self._save_prefix is not None:
+            # Stream the top-level object piece by piece: only the state is encoded per save
+            with gzip.open(save_file, 'wb', compresslevel=SAVE_COMPRESSLEVEL) as f:
+                f.write(self._save_prefix)
+                f.write(orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS))
+                f.write(b',"timestamp":' + orjson.dumps(timestamp))
+                f.write(b',"version":' + orjson.dumps(version) + b'}')
+        else:
+            write_json(save_file, {
+                "game_info": self.game_info,
+                "state": state,
+                "timestamp": timestamp,
+                "version": version
+            }, compress=True)
+        # Drop saves in other formats (e.g. from older versions) left for this slot
+        for other_suffix in SAVE_SUFFIXES:
+            if other_suffix != SAVE_SUFFIX:
+                stale_file = self.save_dir / f"{slot_name}{other_suffix}"
+                if stale_file.exists():
+                    stale_file.unlink()
+        write_json(self.save_dir / f"{slot_name}{SAVE_META_SUFFIX}", {
+            "name": slot_name,
+            "timestamp": timestamp,
+            "scene": state["current_scene"],
+            "version": version
+        })
 
         if self.debug:
             print(f"[DEBUG] Game saved to {save_file}")
@@ -416,15 +589,15 @@ class TextAdventureEngine:
         Returns:
             True if successful, False otherwise
         """
-        save_file = self.save_dir / f"{slot_name}.json"
+        save_file = self._find_save(slot_name)
 
-        if not save_file.exists():
+        if save_file is None:
             return False
 
-        with open(save_file, 'r', encoding='utf-8') as f:
-            save_data = json.load(f)
+        save_data = read_json(save_file)
 
         self.state = GameState.from_dict(save_data["state"])
+        self.invalidate_choices()
         self._trigger_hooks("on_load", slot_name)
 
         if self.debug:
@@ -433,36 +606,79 @@ class TextAdventureEngine:
         return True
 
     def list_saves(self) -> List[Dict[str, Any]]:
-        """List all save files."""
+        """
+        List all save files.
+
+        Each slot is summarized from its small .meta.json companion file; the
+        full save is only parsed when the companion is missing or older.
+        """
+        with os.scandir(self.save_dir) as it:
+            entries = {entry.name: entry for entry in it if entry.is_file()}
+
         saves = []
-        for save_file in self.save_dir.glob("*.json"):
+        for filename, entry in entries.items():
+            if filename.endswith(SAVE_META_SUFFIX):
+                continue
+            for suffix in SAVE_SUFFIXES:
+                if filename.endswith(suffix):
+                    slot_name = filename[:-len(suffix)]
+                    break
+            else:
+                continue
+            # List each slot once, from the file load_game would pick
+            preferred = next(sfx for sfx in SAVE_SUFFIXES if slot_name + sfx in entries)
+            if slot_name + preferred != filename:
+                continue
+
+            meta_entry = entries.get(slot_name + SAVE_META_SUFFIX)
             try:
-                with open(save_file, 'r', encoding='utf-8') as f:
-                    save_data = json.load(f)
-                saves.append({
-                    "name": save_file.stem,
-                    "timestamp": save_data.get("timestamp", "Unknown"),
-                    "scene": save_data["state"]["current_scene"],
-                    "version": save_data.get("version", "Unknown")
-                })
+                if meta_entry is not None and meta_entry.stat().st_mtime >= entry.stat().st_mtime:
+                    saves.append({**read_json(meta_entry.path), "name": slot_name})
+                else:
+                    saves.append(self._save_summary(slot_name, read_json(entry.path)))
             except Exception as e:
                 if self.debug:
-                    print(f"[DEBUG] Failed to read {save_file}: {e}")
+                    print(f"[DEBUG] Failed to read {entry.path}: {e}")
 
         return sorted(saves, key=lambda x: x["timestamp"], reverse=True)
 
+    def _find_save(self, slot_name: str) -> Optional[Path]:
+        """Return the save file of a slot (compressed first, then legacy), or None."""
+        for suffix in SAVE_SUFFIXES:
+            save_file = self.save_dir / f"{slot_name}{suffix}"
+            if save_file.exists():
+                return save_file
+        return None
+
+    def _save_summary(self, slot_name: str, save_data: Dict) -> Dict[str, Any]:
+        """Build the list_saves entry for a save."""
+        return {
+            "name": slot_name,
+            "timestamp": save_data.get("timestamp", "Unknown"),
+            "scene": save_data["state"]["current_scene"],
+            "version": save_data.get("version", "Unknown")
+        }
+
     def render_scene(self) -> Dict[str, Any]:
         """
         Render the current scene for display.
 
+        The rendered dict is cached per (scene id, state version) and returned
+        as-is until the state changes, so callers must not modify it.
+
         Returns:
             Dictionary containing scene data and UI elements
         """
+        key = (self.state.current_scene, self._state_version)
+        cache = self._render_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
         scene = self.get_current_scene()
         if not scene:
             return {"error": "Scene not found"}
 
-        return {
+        rendered = {
             "title": scene.title,
             "description": scene.description,
             "choices": [{"index": i, "text": c.text} for i, c in enumerate(self.get_available_choices())],
@@ -472,8 +688,8 @@ class TextAdventureEngine:
                 "size": self.state.size,
                 "knowledge": self.state.knowledge,
                 "gold": self.state.gold,
-                "inventory": self.state.inventory,
-                "achievements": self.state.achievements,
+                "inventory": list(self.state.inventory),
+                "achievements": list(self.state.achievements),
                 "stats": self.state.stats
             },
             "media": {
@@ -482,6 +698,8 @@ class TextAdventureEngine:
                 "narrator": scene.narrator
             }
         }
+        self._render_cache = (key, rendered)
+        return rendered
 
     def get_ending(self) -> Optional[Dict]:
         """
@@ -493,10 +711,9 @@ class TextAdventureEngine:
         endings = self.script.get("endings", [])
 
         # Check for special endings with requirements
-        for ending in endings:
-            if ending.get("requirements"):
-                if self._check_requirements(ending["requirements"]):
-                    return ending
+        for ending, predicate in self._ending_predicates:
+            if predicate(self.state):
+                return ending
 
         # Default to morality-based endings
         morality = self.state.morality
@@ -512,12 +729,43 @@ class TextAdventureEngine:
     def jump_to_scene(self, scene_id: str):
         """Jump directly to a scene (for debugging/testing)."""
         self.state.current_scene = scene_id
+        self.invalidate_choices()
 
     def set_state(self, **kwargs):
         """Set specific state values (for debugging/testing)."""
         for key, value in kwargs.items():
             if hasattr(self.state, key):
+                if key in ("inventory", "achievements", "visited"):
+                    value = dict.fromkeys(value, True)
                 setattr(self.state, key, value)
+        self.invalidate_choices()
+
+
+def write_json(path: Path, data: Any, compress: bool = False):
+    """Write data as indented JSON (gzip-compressed if requested), using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    if compress:
+        with gzip.open(path, 'wb', compresslevel=SAVE_COMPRESSLEVEL) as f:
+            f.write(payload)
+    else:
+        with open(path, 'wb') as f:
+            f.write(payload)
+
+
+def read_json(path: Path) -> Any:
+    """Read a JSON file, transparently gunzipping it when it starts with the gzip magic bytes."""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    if payload[:2] == b"\x1f\x8b":
+        payload = gzip.decompress(payload)
+
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload.decode('utf-8'))
 
 
 def load_script(script_path: str) -> Dict:
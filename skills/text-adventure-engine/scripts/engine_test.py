@@ -0,0 +1,220 @@
+import os
+import tempfile
+import unittest
+
+from engine import GameState, TextAdventureEngine, _compile_requirements
+
+
+def make_script():
+    """Two scenes; the hall has a choice that needs the key."""
+    return {
+        "scenes": [
+            {
+                "id": "start",
+                "title": "Start",
+                "description": "A door.",
+                "choices": [{"text": "Enter", "next_scene": "hall"}]
+            },
+            {
+                "id": "hall",
+                "title": "Hall",
+                "description": "A locked chest.",
+                "choices": [
+                    {"text": "Leave", "next_scene": "start"},
+                    {"text": "Open the chest", "next_scene": "start", "requirements": {"has_item": "key"}}
+                ]
+            }
+        ]
+    }
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestHookCacheInvalidation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = TextAdventureEngine(make_script(), save_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def give_key(self, *args):
+        # Look at the scene first, as a logging or UI hook would, then change the state
+        self.engine.render_scene()
+        self.engine.state.inventory["key"] = True
+
+    def test_scene_enter_hook_mutation_is_rendered(self):
+        """Changes made by an on_scene_enter hook show up in the next render and choice list"""
+        self.engine.register_hook("on_scene_enter", self.give_key)
+        self.engine.render_scene()  # Warm the caches for the start scene
+
+        self.assertTrue(self.engine.make_choice(0))
+
+        rendered = self.engine.render_scene()
+        self.assertIn("key", rendered["state"]["inventory"])
+        self.assertEqual([c["text"] for c in rendered["choices"]], ["Leave", "Open the chest"])
+        self.assertEqual(self.engine.num_available_choices(), 2)
+
+    def test_load_hook_mutation_is_rendered(self):
+        """Changes made by an on_load hook show up in the next render and choice list"""
+        self.engine.make_choice(0)
+        self.engine.save_game("slot")
+        self.assertEqual(len(self.engine.render_scene()["choices"]), 1)
+
+        self.engine.register_hook("on_load", self.give_key)
+        self.assertTrue(self.engine.load_game("slot"))
+
+        rendered = self.engine.render_scene()
+        self.assertIn("key", rendered["state"]["inventory"])
+        self.assertEqual(len(rendered["choices"]), 2)
+
+    def test_render_is_cached_without_state_change(self):
+        """Rendering twice without a state change reuses the cached result"""
+        self.assertIs(self.engine.render_scene(), self.engine.render_scene())
+
+
+def reference_check(state, requirements):
+    """The original if-chain requirement check, with visited_scene matching scene ids"""
+    if not requirements:
+        return True
+    if "has_item" in requirements and requirements["has_item"] not in state.inventory:
+        return False
+    if "has_any_item" in requirements and not any(item in state.inventory for item in requirements["has_any_item"]):
+        return False
+    if "has_all_items" in requirements and not all(item in state.inventory for item in requirements["has_all_items"]):
+        return False
+    if "flag" in requirements:
+        flag_name, flag_value = requirements["flag"]
+        if state.flags.get(flag_name) != flag_value:
+            return False
+    if "flag_set" in requirements and requirements["flag_set"] not in state.flags:
+        return False
+    if "flag_not_set" in requirements and requirements["flag_not_set"] in state.flags:
+        return False
+    for stat in ["morality", "size", "hp", "knowledge", "gold"]:
+        if f"{stat}_min" in requirements and getattr(state, stat) < requirements[f"{stat}_min"]:
+            return False
+        if f"{stat}_max" in requirements and getattr(state, stat) > requirements[f"{stat}_max"]:
+            return False
+    if "stat_min" in requirements:
+        stat_name, min_value = requirements["stat_min"]
+        if state.stats.get(stat_name, 0) < min_value:
+            return False
+    if "has_achievement" in requirements and requirements["has_achievement"] not in state.achievements:
+        return False
+    if "visited_scene" in requirements:
+        if not any(entry.partition(":")[0] == requirements["visited_scene"] for entry in state.history):
+            return False
+    return True
+
+
+# (description, requirements, GameState keyword arguments, expected result)
+REQUIREMENT_CASES = [
+    ("no requirements", None, {}, True),
+    ("empty requirements", {}, {}, True),
+    ("has_item held", {"has_item": "key"}, {"inventory": ["key"]}, True),
+    ("has_item missing", {"has_item": "key"}, {"inventory": ["rope"]}, False),
+    ("has_any_item one held", {"has_any_item": ["key", "rope"]}, {"inventory": ["rope"]}, True),
+    ("has_any_item none held", {"has_any_item": ["key", "rope"]}, {}, False),
+    ("has_all_items all held", {"has_all_items": ["key", "rope"]}, {"inventory": ["rope", "key"]}, True),
+    ("has_all_items one missing", {"has_all_items": ["key", "rope"]}, {"inventory": ["key"]}, False),
+    ("flag equal", {"flag": ["door", True]}, {"flags": {"door": True}}, True),
+    ("flag different", {"flag": ["door", True]}, {"flags": {"door": False}}, False),
+    ("flag False but absent", {"flag": ["door", False]}, {}, False),
+    ("flag False and set False", {"flag": ["door", False]}, {"flags": {"door": False}}, True),
+    ("flag non-bool value", {"flag": ["mood", "angry"]}, {"flags": {"mood": "angry"}}, True),
+    ("flag_set present", {"flag_set": "door"}, {"flags": {"door": False}}, True),
+    ("flag_set absent", {"flag_set": "door"}, {}, False),
+    ("flag_not_set absent", {"flag_not_set": "door"}, {}, True),
+    ("flag_not_set present", {"flag_not_set": "door"}, {"flags": {"door": False}}, False),
+    ("morality_min at bound", {"morality_min": 50}, {"morality": 50}, True),
+    ("morality_min below", {"morality_min": 50}, {"morality": 49}, False),
+    ("morality_max above", {"morality_max": 50}, {"morality": 51}, False),
+    ("size_min below", {"size_min": 10}, {"size": 5}, False),
+    ("size_max at bound", {"size_max": 10}, {"size": 10}, True),
+    ("hp_min met", {"hp_min": 20}, {"hp": 80}, True),
+    ("hp_max above", {"hp_max": 20}, {"hp": 80}, False),
+    ("knowledge_min below", {"knowledge_min": 100}, {"knowledge": 99}, False),
+    ("knowledge_max met", {"knowledge_max": 100}, {"knowledge": 0}, True),
+    ("gold_min met", {"gold_min": 5}, {"gold": 5}, True),
+    ("gold_max above", {"gold_max": 5}, {"gold": 6}, False),
+    ("stat_min met", {"stat_min": ["courage", 3]}, {"stats": {"courage": 3}}, True),
+    ("stat_min unset stat", {"stat_min": ["courage", 1]}, {}, False),
+    ("stat_min zero on unset stat", {"stat_min": ["courage", 0]}, {}, True),
+    ("has_achievement held", {"has_achievement": "Hero"}, {"achievements": ["Hero"]}, True),
+    ("has_achievement missing", {"has_achievement": "Hero"}, {}, False),
+    ("visited_scene visited", {"visited_scene": "cave"}, {"history": ["cave:Go deeper"]}, True),
+    ("visited_scene not visited", {"visited_scene": "cave"}, {"history": ["forest:Walk"]}, False),
+    ("visited_scene only in choice text", {"visited_scene": "cave"}, {"history": ["forest:Enter the cave"]}, False),
+    ("unknown key ignored", {"weather": "rain"}, {}, True),
+    ("combined all met", {"has_item": "key", "morality_min": 40, "flag": ["door", True], "visited_scene": "cave"},
+     {"inventory": ["key"], "morality": 60, "flags": {"door": True}, "history": ["cave:Go"]}, True),
+    ("combined one failing", {"has_item": "key", "morality_min": 40, "flag": ["door", True]},
+     {"inventory": ["key"], "morality": 30, "flags": {"door": True}}, False),
+]
+
+
+class TestRequirementChecks(unittest.TestCase):
+
+    def test_compiled_predicates_match_reference(self):
+        """Compiled predicates agree with the original if-chain for every requirement type"""
+        for description, requirements, state_kwargs, expected in REQUIREMENT_CASES:
+            with self.subTest(description):
+                state = GameState(**state_kwargs)
+                self.assertEqual(reference_check(state, requirements), expected)
+                self.assertEqual(_compile_requirements(requirements)(state), expected)
+
+    def test_engine_check_requirements_matches_reference(self):
+        """TextAdventureEngine._check_requirements gives the same answers"""
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = TextAdventureEngine(make_script(), save_dir=tmp)
+            for description, requirements, state_kwargs, expected in REQUIREMENT_CASES:
+                with self.subTest(description):
+                    engine.set_state(**GameState(**state_kwargs).to_dict())
+                    self.assertEqual(engine._check_requirements(requirements), expected)
+
+    def test_choices_filtered_by_requirements(self):
+        """get_available_choices applies the same checks to scene choices"""
+        script = {"scenes": [{
+            "id": "start",
+            "title": "Start",
+            "description": "",
+            "choices": [
+                {"text": description, "next_scene": "start", "requirements": requirements}
+                for description, requirements, _, _ in REQUIREMENT_CASES
+            ]
+        }]}
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = TextAdventureEngine(script, save_dir=tmp)
+            for description, requirements, state_kwargs, expected in REQUIREMENT_CASES:
+                with self.subTest(description):
+                    engine.set_state(**{**GameState(**state_kwargs).to_dict(), "current_scene": "start"})
+                    available = {choice.text for choice in engine.get_available_choices()}
+                    self.assertEqual(description in available, expected)
+
+
+class TestSaveFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = TextAdventureEngine(make_script(), save_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_autosave_is_compressed_json(self):
+        """The autosave slot is written as gzip JSON like any other slot"""
+        path = self.engine.save_game()
+        self.assertTrue(path.endswith(".json.gz"))
+        self.assertTrue(self.engine.load_game())
+
+    def test_pickle_files_are_never_loaded(self):
+        """A .pkl file dropped into the save folder is neither listed nor loaded"""
+        with open(os.path.join(self.tmp.name, "autosave.pkl"), "wb") as f:
+            f.write(b"not a save")
+        self.assertEqual(self.engine.list_saves(), [])
+        self.assertFalse(self.engine.load_game())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,97 +17,133 @@ from scripts.engine import create_engine
 class GamePlayer:
     """Simple CLI player for text adventure games."""
 
+    # Static decorations, built once
+    _SEP = "=" * 60
+    _DASH = "-" * 60
+    _ARROWS = "➤ " * 20
+    _BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))  # Indexed by value // 10
+
     def __init__(self, script_path="scripts/example_game.json", save_dir="./saves"):
         """Initialize the game player."""
         self.engine = create_engine(script_path, save_dir=save_dir)
         self.running = True
+        self._stats_cache = None  # (shown values, rendered stats block)
 
     def clear_screen(self):
-        """Clear the terminal screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Clear the terminal screen with ANSI escapes (no shell process per frame)."""
+        if os.name == 'nt' and not os.environ.get('WT_SESSION'):
+            # Legacy cmd.exe consoles may not honor ANSI escapes
+            os.system('cls')
+            return
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
 
     def print_header(self, text: str):
         """Print a formatted header."""
-        print("\n" + "=" * 60)
-        print(f"  {text}")
-        print("=" * 60)
+        sys.stdout.write(self._format_header(text))
+
+    def _format_header(self, text: str) -> str:
+        """Build a formatted header (with trailing newline)."""
+        return f"\n{self._SEP}\n  {text}\n{self._SEP}\n"
 
     def print_separator(self):
         """Print a visual separator."""
-        print("-" * 60)
+        print(self._DASH)
 
-    def display_scene(self):
-        """Display the current scene."""
-        scene = self.engine.render_scene()
+    def display_scene(self, scene: dict = None):
+        """
+        Display the current scene (rendered by the engine unless given).
+
+        The whole frame is assembled first and written to stdout in one go.
+        """
+        if scene is None:
+            scene = self.engine.render_scene()
 
         # Clear screen for new scene
         self.clear_screen()
 
-        # Title
-        self.print_header(scene['title'])
-
-        # Description
-        print("\n" + scene['description'] + "\n")
+        # Title and description
+        parts = [self._format_header(scene['title']), "\n", scene['description'], "\n\n"]
 
         # Display stats if not on start/menu screens
         if scene['title'] not in ["🎮 The Beginning", "📖 How to Play", "🏆 Achievements"]:
-            self.display_stats(scene['state'])
+            parts += [self._format_stats(scene['state']), "\n"]
 
         # Display choices
         if scene['choices']:
-            print("\n" + "➤ " * 20)
-            print("\n  What do you do?\n")
+            parts += ["\n", self._ARROWS, "\n", "\n  What do you do?\n\n"]
             for i, choice in enumerate(scene['choices']):
-                print(f"  [{i+1}] {choice['text']}")
-            print("\n" + "➤ " * 20)
+                parts.append(f"  [{i+1}] {choice['text']}\n")
+            parts += ["\n", self._ARROWS, "\n"]
 
             # Special options
-            print("\n  [S] Save Game  |  [L] Load Game  |  [Q] Quit")
+            parts.append("\n  [S] Save Game  |  [L] Load Game  |  [Q] Quit\n")
         else:
             # End of game
-            print("\n" + "=" * 60)
-            print("  THE END")
-            print("=" * 60)
-            print("\n  [R] Play Again  |  [Q] Quit")
+            parts += ["\n", self._SEP, "\n  THE END\n", self._SEP, "\n"]
+            parts.append("\n  [R] Play Again  |  [Q] Quit\n")
+
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
 
     def display_stats(self, state: dict):
         """Display player stats."""
-        print("\n  ┌─ YOUR STATUS ─────────────────────────────┐")
+        sys.stdout.write(self._format_stats(state) + "\n")
+
+    def _format_stats(self, state: dict) -> str:
+        """Build the stats block, reusing the last one while the shown values are unchanged."""
+        inventory = state['inventory']
+        key = (state['hp'], state['morality'], state.get('knowledge', 0), state.get('gold', 0),
+               tuple(inventory[:3]), len(inventory), len(state['achievements']))
+        if self._stats_cache is not None and self._stats_cache[0] == key:
+            return self._stats_cache[1]
+
+        lines = ["\n  ┌─ YOUR STATUS ─────────────────────────────┐"]
 
         # Health bar
         hp = state['hp']
-        hp_bar = "█" * (hp // 10) + "░" * (10 - hp // 10)
-        print(f"  │  ❤️  Health:  [{hp_bar}] {hp}/100")
+        lines.append(f"  │  ❤️  Health:  [{self._bar(hp)}] {hp}/100")
 
         # Morality bar
         morality = state['morality']
         morality_label = "💖 Heroic" if morality >= 70 else "⚖️ Neutral" if morality >= 40 else "😈 Dark"
-        morality_bar = "█" * (morality // 10) + "░" * (10 - morality // 10)
-        print(f"  │  {morality_label}: [{morality_bar}] {morality}/100")
+        lines.append(f"  │  {morality_label}: [{self._bar(morality)}] {morality}/100")
 
         # Other stats
         if state.get('knowledge', 0) > 0:
-            print(f"  │  🧠 Knowledge: {state['knowledge']}")
+            lines.append(f"  │  🧠 Knowledge: {state['knowledge']}")
         if state.get('gold', 0) > 0:
-            print(f"  │  💰 Gold: {state['gold']}")
+            lines.append(f"  │  💰 Gold: {state['gold']}")
 
         # Inventory
-        if state['inventory']:
-            items = ", ".join(state['inventory'][:3])
-            if len(state['inventory']) > 3:
-                items += f" (+{len(state['inventory']) - 3} more)"
-            print(f"  │  🎒 Items: {items}")
+        if inventory:
+            items = ", ".join(inventory[:3])
+            if len(inventory) > 3:
+                items += f" (+{len(inventory) - 3} more)"
+            lines.append(f"  │  🎒 Items: {items}")
 
         # Achievements
         if state['achievements']:
-            print(f"  │  🏆 Achievements: {len(state['achievements'])}")
+            lines.append(f"  │  🏆 Achievements: {len(state['achievements'])}")
 
-        print("  └──────────────────────────────────────────┘")
+        lines.append("  └──────────────────────────────────────────┘")
 
-    def get_input(self) -> str:
-        """Get and validate user input."""
-        scene = self.engine.render_scene()
-        num_choices = len(scene['choices'])
+        text = "\n".join(lines)
+        self._stats_cache = (key, text)
+        return text
+
+    def _bar(self, value: int) -> str:
+        """Return the 10-cell bar for a 0-100 value."""
+        if 0 <= value <= 100:
+            return self._BARS[value // 10]
+        return "█" * (value // 10) + "░" * (10 - value // 10)
+
+    def get_input(self, scene: dict = None) -> str:
+        """Get and validate user input for the given (or current) scene."""
+        if scene is None:
+            num_choices = self.engine.num_available_choices()
+        else:
+            num_choices = len(scene['choices'])
 
         while True:
             try:
@@ -235,14 +271,15 @@ class GamePlayer:
 
         # Main game loop
         while self.running:
-            self.display_scene()
+            # Render once per turn and share it with display and input handling
+            scene = self.engine.render_scene()
+            self.display_scene(scene)
 
             # Check for game over
-            scene = self.engine.render_scene()
             if not scene['choices']:
                 # End of game - wait for restart or quit
                 while True:
-                    cmd = self.get_input()
+                    cmd = self.get_input(scene)
                     if cmd == 'RESTART':
                         # Restart game
                         self.__init__("scripts/example_game.json", save_dir="./saves")
@@ -253,7 +290,7 @@ class GamePlayer:
                 continue
 
             # Get and handle player input
-            choice = self.get_input()
+            choice = self.get_input(scene)
 
             if choice == 'QUIT':
                 # Confirm quit